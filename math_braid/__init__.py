@@ -1 +1,7 @@
 from .braid import Braid, B  # noqa: F401
+from .braid_group import BraidGroup  # noqa: F401
+from .batch import BraidBatch  # noqa: F401
+from .packed import PackedBraid  # noqa: F401
+from .builder import BraidBuilder  # noqa: F401
+from .artin import ArtinBraid  # noqa: F401
+from .sampler import NormalFormSampler  # noqa: F401
@@ -0,0 +1,389 @@
+#!/usr/bin/python
+
+"""
+Braids in the classical Garside structure of B_n.
+
+Here the simple elements are the n! permutation braids (positive braids
+in which each pair of strands crosses at most once), the fundamental
+element Delta has length n(n-1)/2, and sigma_i maps to the transposition
+of strands i - 1 and i.  A braid is kept in left normal form
+Delta^p A_1 ... A_k, where each pair A_j, A_{j+1} is left-weighted: every
+generator that starts A_{j+1} also finishes A_j.
+
+Permutation braids are tuples w with (x * y)[i] = x[y[i]], so the word
+sigma_{i_1} ... sigma_{i_m} is s_{i_1} * ... * s_{i_m}.
+
+The band-generator structure of Braid has many more canonical factors per
+braid but each is cheap (Catalan(n) simple elements); this one has fewer,
+longer factors, which pays off for some Artin-generator-heavy inputs.
+See extras/benchmark_structures.py.
+
+"""
+
+from .braid import Braid
+from .builder import BraidBuilder
+from .handle import artinWord
+
+
+####################
+# Permutation braids
+####################
+
+
+def _compose(x, y):
+    return tuple([x[v] for v in y])
+
+
+def _inverse(x):
+    ans = [0] * len(x)
+    for i, v in enumerate(x):
+        ans[v] = i
+    return tuple(ans)
+
+
+def _delta(n):
+    return tuple(range(n - 1, -1, -1))
+
+
+def _tau(x, power=1):
+    """Delta^{-power} x Delta^{power}; tau is an involution."""
+    if not power % 2:
+        return x
+    n = len(x)
+    return tuple([n - 1 - x[n - 1 - i] for i in range(0, n)])
+
+
+def _complement(x):
+    """The simple element x^{-1} Delta."""
+    return _compose(_inverse(x), _delta(len(x)))
+
+
+def _leftWeightPair(a, j):
+    """
+    Make the pair a[j], a[j + 1] left-weighted, in place, by moving
+    generators that start a[j + 1] but don't finish a[j] one at a time.
+    Returns True if the pair changed.
+    """
+    left = list(a[j])
+    right_inv = list(_inverse(a[j + 1]))
+    changed = False
+    i = 0
+    while i < len(left) - 1:
+        # s_i starts right and does not finish left
+        if right_inv[i] > right_inv[i + 1] and left[i] < left[i + 1]:
+            left[i], left[i + 1] = left[i + 1], left[i]
+            right_inv[i], right_inv[i + 1] = right_inv[i + 1], right_inv[i]
+            changed = True
+            i = max(i - 1, 0)
+        else:
+            i += 1
+    if changed:
+        a[j] = tuple(left)
+        a[j + 1] = _inverse(right_inv)
+    return changed
+
+
+def _absorbRight(a, i):
+    """
+    Left-weight a[:i + 1] in place, given that a[:i] is left-weighted.
+
+    a[i] moves left only while the pairs it meets change.  A Delta that
+    forms on the way passes everything to its left, leaving tau of each
+    factor behind, so it goes straight to the front.
+    """
+    delta = _delta(len(a[i]))
+    j = i - 1
+    while j >= 0 and _leftWeightPair(a, j):
+        if a[j] == delta:
+            a[1:j + 1] = [_tau(x) for x in a[:j]]
+            a[0] = delta
+            break
+        j -= 1
+
+
+def _reducedWord(x):
+    """A positive Artin word for a permutation braid."""
+    x = list(x)
+    word = []
+    i = 0
+    while i < len(x) - 1:
+        # x = x' * s_i when x[i] > x[i + 1]
+        if x[i] > x[i + 1]:
+            x[i], x[i + 1] = x[i + 1], x[i]
+            word.append(i + 1)
+            i = max(i - 1, 0)
+        else:
+            i += 1
+    word.reverse()
+    return word
+
+
+##############
+# ArtinBraid #
+##############
+
+
+class ArtinBraid:
+    """
+    A braid in left normal form Delta^p A_1 ... A_k for the classical
+    Garside structure, with the same interface as Braid.
+
+    Properties:
+        n: braid width (number of strands)
+        p: power of Delta
+        k: number of permutation braids (implemented via a getter)
+        a: list of permutation braids, as tuples
+
+    Input can be any of:
+        * Another ArtinBraid to copy, or a Braid to convert (obj)
+        * A list of Artin generators, given as integers (obj)
+        * A power of Delta (p) and a list of permutations (obj)
+
+    >>> b = ArtinBraid([1, 2, 1, -3, 2], 4)
+    >>> b
+    ArtinBraid(4, [(0, 3, 2, 1), (3, 2, 0, 1), (0, 2, 1, 3)], -1)
+    >>> b == ArtinBraid([2, 1, 2, -3, 2], 4)
+    True
+    >>> not b * ~b
+    True
+    >>> b * ArtinBraid([-2, 3], 4) == ArtinBraid([1, 2, 1], 4)
+    True
+
+    Converting between the two structures
+    >>> x = Braid([1, -2, 3, 3, -4, 1], 5)
+    >>> y = ArtinBraid(x)
+    >>> y.toBraid() == x
+    True
+    >>> str(y)
+    '[5] Delta^(-1) * [2, 0, 4, 3, 1] * [3, 0, 1, 4, 2] * [1, 0, 4, 2, 3]'
+    >>> y.k, x.k
+    (3, 4)
+
+    Powers of Delta
+    >>> ArtinBraid([], 4, 3).p, Braid([], 4, 3).p
+    (3, 3)
+
+    """
+
+    def __init__(self, obj=None, n=None, p=None):
+        if isinstance(obj, ArtinBraid):
+            self.n = obj.n
+            self.p = obj.p
+            self.a = list(obj.a)
+            self.clean = obj.clean
+        elif isinstance(obj, Braid):
+            self.__init__(artinWord(obj), obj.n)
+        elif isinstance(obj, list) and n is not None:
+            self.n = n
+            self.clean = False
+            if not obj:
+                # Identity elements and powers of Delta, as in Braid
+                self.p = p or 0
+                self.a = []
+                self.clean = True
+            elif not isinstance(obj[0], int):
+                # Permutation braids and a power of Delta
+                self.p = p or 0
+                self.a = [tuple(x) for x in obj]
+            else:
+                self.__createFromArtin(obj)
+        elif not obj:
+            self.n = n or 0
+            self.p = p or 0
+            self.a = []
+            self.clean = True
+        else:
+            raise NotImplementedError
+
+    def __createFromArtin(self, word):
+        # Absorb the word one letter at a time, as BraidBuilder does:
+        # sigma_i^{-1} = (sigma_i^{-1} Delta) Delta^{-1}, and moving the
+        # Delta^{-1} to the front applies tau to every factor so far.  Tau
+        # is an involution, so each factor records the parity of the frame
+        # it was stored in.
+        n = self.n
+        delta = _delta(n)
+        identity = tuple(range(0, n))
+        a = []
+        stamps = []
+        parity = 0
+        self.p = 0
+        for x in word:
+            if 0 < x < n:
+                factor = list(identity)
+                i = x - 1
+            elif -n < x < 0:
+                factor = list(delta)
+                i = n - 1 + x
+            else:
+                continue
+            factor[i], factor[i + 1] = factor[i + 1], factor[i]
+            a.append(tuple(factor))
+            stamps.append(parity)
+            j = len(a) - 2
+            while j >= 0:
+                pair = [_tau(a[j], parity ^ stamps[j]), _tau(a[j + 1], parity ^ stamps[j + 1])]
+                if not _leftWeightPair(pair, 0):
+                    break
+                a[j:j + 2] = pair
+                stamps[j] = stamps[j + 1] = parity
+                if pair[0] == delta:
+                    # Delta passes everything to its left: flip the frame
+                    # for those factors, keeping the ones to its right
+                    del a[j]
+                    del stamps[j]
+                    a.insert(0, delta)
+                    stamps.insert(0, parity)
+                    parity ^= 1
+                    for m in range(j + 1, len(a)):
+                        stamps[m] ^= 1
+                    break
+                j -= 1
+            while a and a[-1] == identity:
+                del a[-1]
+                del stamps[-1]
+            if x < 0:
+                self.p -= 1
+                parity ^= 1
+        self.a = [_tau(x, parity ^ s) for x, s in zip(a, stamps)]
+        self.__cut()
+        self.clean = True
+
+    ##############
+    # Normalizer #
+    ##############
+
+    def cleanUpFactors(self):
+        if self.clean:
+            return
+        self.clean = True
+        # Absorb the factors from left to right
+        a = self.a
+        for i in range(1, len(a)):
+            _absorbRight(a, i)
+        self.__cut()
+
+    def __cut(self):
+        # Cut out the identity elements from the right
+        # and copies of Delta from the left
+        a = self.a
+        identity = tuple(range(0, self.n))
+        delta = _delta(self.n)
+        while a and a[-1] == identity:
+            del a[-1]
+        lead = 0
+        while lead < len(a) and a[lead] == delta:
+            lead += 1
+        del a[:lead]
+        self.p += lead
+
+    ####################
+    # Group Arithmetic #
+    ####################
+
+    def __mul__(self, other):
+        """Multiplication of braids."""
+        if not isinstance(other, ArtinBraid) or self.n != other.n:
+            return NotImplemented
+        self.cleanUpFactors()
+        other.cleanUpFactors()
+        a = [_tau(x, other.p) for x in self.a] + other.a
+        ans = ArtinBraid(n=self.n, p=self.p + other.p)
+        # Both halves are left-weighted, so only the junction needs work;
+        # absorb the shorter half into the longer one
+        s = self.k
+        if s <= len(a) - s:
+            for i in range(s - 1, -1, -1):
+                j = i
+                while j < len(a) - 1 and _leftWeightPair(a, j):
+                    j += 1
+        else:
+            for i in range(s, len(a)):
+                _absorbRight(a, i)
+        ans.a = a
+        ans.__cut()
+        ans.clean = True
+        return ans
+
+    def __invert__(self):
+        """Inverse of a braid; the inverse of a normal form is normal."""
+        self.cleanUpFactors()
+        k = self.k
+        a = [_tau(_complement(self.a[i]), -self.p - i - 1)
+             for i in range(k - 1, -1, -1)]
+        ans = ArtinBraid(n=self.n, p=-self.p - k)
+        ans.a = a
+        return ans
+
+    def __eq__(self, other):
+        """Equality test."""
+        if not isinstance(other, ArtinBraid) or self.n != other.n:
+            return NotImplemented
+        self.cleanUpFactors()
+        other.cleanUpFactors()
+        return self.p == other.p and self.a == other.a
+
+    def __hash__(self):
+        self.cleanUpFactors()
+        return hash((self.n, self.p, tuple(self.a)))
+
+    def __bool__(self):
+        self.cleanUpFactors()
+        return self.p != 0 or self.k != 0
+    __nonzero__ = __bool__
+
+    def __len__(self):
+        """Return the number of permutation braids."""
+        return len(self.a)
+
+    @property
+    def k(self):
+        return len(self)
+
+    ###############
+    # Conversions #
+    ###############
+
+    def getArtinWord(self):
+        """
+        A word in Artin generators for this braid.
+
+        >>> ArtinBraid([1, 2, -1], 3).getArtinWord()
+        [-1, -2, -1, 2, 1, 1, 2]
+
+        """
+        self.cleanUpFactors()
+        delta = []
+        for i in range(1, self.n):
+            delta.extend(range(i, 0, -1))
+        if self.p >= 0:
+            word = delta * self.p
+        else:
+            word = [-x for x in reversed(delta)] * -self.p
+        for x in self.a:
+            word.extend(_reducedWord(x))
+        return word
+
+    def toBraid(self):
+        """Convert to the band-generator structure."""
+        builder = BraidBuilder(self.n)
+        builder.extend(self.getArtinWord())
+        return builder.braid()
+
+    ###########
+    # Display #
+    ###########
+
+    def __str__(self):
+        self.cleanUpFactors()
+        return '[%s] Delta^(%s) * %s' % (
+            self.n, self.p, ' * '.join(str(list(x)) for x in self.a))
+
+    def __repr__(self):
+        self.cleanUpFactors()
+        return 'ArtinBraid(%s, %r, %s)' % (self.n, self.a, self.p)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
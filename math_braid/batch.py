@@ -0,0 +1,373 @@
+#!/usr/bin/python
+
+"""
+Vectorized arithmetic on batches of braids of the same width.
+
+A batch stores the canonical factors of many braids in one NumPy array
+of shape (braids, factors, n).  Rows shorter than the longest braid are
+padded on the right with identity factors, so tau, inversion, products,
+meets and left-weighting all run over the whole batch at once.
+
+The factor functions below take arrays whose last axis has length n and
+agree with the corresponding CanonicalFactor methods.
+
+"""
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from .braid import Braid
+from .canonical_factor import CanonicalFactor
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('BraidBatch requires numpy')
+
+
+####################
+# Factor functions #
+####################
+
+
+def identity(n, shape=()):
+    """Identity factors of width n, broadcast to the given shape."""
+    _require_numpy()
+    return np.broadcast_to(np.arange(n), tuple(shape) + (n,)).copy()
+
+
+def delta(n):
+    """
+    The fundamental factor D of width n.
+
+    >>> delta(5).tolist()
+    [4, 0, 1, 2, 3]
+
+    """
+    return np.roll(identity(n), 1)
+
+
+def multiply(x, y):
+    """
+    Factor product x * y, in the same order as CanonicalFactor.__mul__.
+
+    >>> x = np.array([0, 1, 3, 2, 4])
+    >>> y = np.array([2, 3, 4, 0, 1])
+    >>> multiply(x, y).tolist()
+    [3, 2, 4, 0, 1]
+
+    """
+    return np.take_along_axis(x, y, axis=-1)
+
+
+def invert(x):
+    """
+    Inverse factors.
+
+    >>> invert(np.array([1, 4, 0, 3, 2])).tolist()
+    [2, 0, 4, 3, 1]
+
+    """
+    ans = np.empty_like(x)
+    np.put_along_axis(ans, x, np.broadcast_to(np.arange(x.shape[-1]), x.shape), axis=-1)
+    return ans
+
+
+def complement(x):
+    """Left complement ~x * D, as used by left-weighting."""
+    return np.roll(invert(x), 1, axis=-1)
+
+
+def tau(x, power=1):
+    """
+    Transformation A --> t^{power}(A), where AD = Dt(A).
+
+    The power may be an integer or an array matching x.shape[:-1].
+
+    >>> x = np.array([[0, 4, 2, 3, 1, 5, 6], [0, 4, 2, 3, 1, 5, 6]])
+    >>> tau(x, np.array([1, 3])).tolist() == [
+    ...     CanonicalFactor(list(x[0])).tau(1).array_form,
+    ...     CanonicalFactor(list(x[0])).tau(3).array_form]
+    True
+
+    """
+    n = x.shape[-1]
+    power = np.asarray(power)[..., None] % n
+    index = (np.arange(n) - power) % n
+    return (np.take_along_axis(x, np.broadcast_to(index, x.shape), axis=-1) + power) % n
+
+
+def d_cycles(x):
+    """Maxima of the descending cycles of each factor (see CanonicalFactor.d_cycles)."""
+    n = x.shape[-1]
+    flat = x.reshape(-1, n)
+    rows = np.arange(len(flat))
+    ans = identity(n, (len(flat),))
+    for i in range(n - 1, -1, -1):
+        down = flat[:, i] < i
+        ans[rows[down], flat[down, i]] = ans[down, i]
+    return ans.reshape(x.shape)
+
+
+def from_d_cycles(d):
+    """Convert descending-cycle maxima back into factors."""
+    n = d.shape[-1]
+    flat = d.reshape(-1, n)
+    rows = np.arange(len(flat))
+    prev = np.full(flat.shape, -1)
+    ans = np.empty_like(flat)
+    for i in range(n):
+        v = flat[:, i]
+        pv = prev[rows, v]
+        ans[:, i] = np.where(pv < 0, v, pv)
+        prev[rows, v] = i
+    return ans.reshape(d.shape)
+
+
+def meet(x, y):
+    """
+    Meets of factor pairs, x /\\ y.
+
+    >>> one = np.array([0, 4, 2, 3, 1, 6, 5])
+    >>> two = np.array([0, 4, 3, 2, 1, 5, 6])
+    >>> meet(one, two).tolist()
+    [0, 4, 2, 3, 1, 5, 6]
+
+    """
+    n = x.shape[-1]
+    shape = np.broadcast_shapes(x.shape, y.shape)
+    one = d_cycles(np.broadcast_to(x, shape)).reshape(-1, n)
+    two = d_cycles(np.broadcast_to(y, shape)).reshape(-1, n)
+    # Each index belongs to the class of (one[i], two[i]); the class
+    # representative is its largest index.  Sort by (class, index) and
+    # read off the index at the end of each run.
+    key = (one * n + two) * n + np.arange(n)
+    key.sort(axis=-1)
+    cls, idx = key // n, key % n
+    ends = np.ones(key.shape, dtype=bool)
+    ends[:, :-1] = cls[:, 1:] != cls[:, :-1]
+    last = np.where(ends, np.arange(n), n)
+    last = np.minimum.accumulate(last[:, ::-1], axis=-1)[:, ::-1]
+    d = np.empty_like(key)
+    np.put_along_axis(d, idx, np.take_along_axis(idx, last, axis=-1), axis=-1)
+    return from_d_cycles(d).reshape(shape)
+
+
+##############
+# BraidBatch #
+##############
+
+
+class BraidBatch:
+    """
+    A batch of braids in B_n, normalized together.
+
+    Properties:
+        n: braid width (number of strands)
+        p: array of powers of D, one per braid
+        k: array of canonical factor counts, one per braid
+        a: array of canonical factors, shape (len(batch), max(k), n)
+
+    Input can be a list of braids or of anything Braid(obj, n) accepts.
+
+    >>> words = [[1, -2, 3], [2, 2, -1, -1], [], [[4, 1], [2, 3]]]
+    >>> batch = BraidBatch(words, 5)
+    >>> [b == Braid(w, 5) for b, w in zip(batch, words)]
+    [True, True, True, True]
+    >>> batch.p.tolist()
+    [-1, -2, 0, -1]
+
+    Arithmetic works row by row
+    >>> other = BraidBatch([Braid([1, 1], 5)] * 4)
+    >>> all(x == Braid(w, 5) * Braid([1, 1], 5)
+    ...     for x, w in zip(batch * other, words))
+    True
+    >>> all(not x for x in batch * ~batch)
+    True
+
+    """
+
+    def __init__(self, braids=None, n=None):
+        _require_numpy()
+        braids = [b if isinstance(b, Braid) else Braid(b, n) for b in braids or []]
+        if n is None:
+            n = braids[0].n if braids else 0
+        if any(b.n != n for b in braids):
+            raise TypeError('Incompatible operands')
+        self.n = n
+        self.p = np.array([b.p for b in braids], dtype=np.intp)
+        self.k = np.array([b.k for b in braids], dtype=np.intp)
+        self.a = identity(n, (len(braids), max(self.k, default=0)))
+        for i, b in enumerate(braids):
+            if b.a:
+                self.a[i, :b.k] = [x.array_form for x in b.a]
+        self.clean = all(b.clean for b in braids)
+
+    @classmethod
+    def fromArrays(cls, n, p, a, k=None, clean=False):
+        """Build a batch from a power array and a (braids, factors, n) array."""
+        ans = cls(n=n)
+        ans.p = np.array(p, dtype=np.intp)
+        ans.a = np.array(a, dtype=np.intp).reshape(len(ans.p), -1, n)
+        if k is None:
+            k = np.full(len(ans.p), ans.a.shape[1])
+        ans.k = np.array(k, dtype=np.intp)
+        ans.clean = clean
+        return ans
+
+    def _copy(self, p, a, k, clean):
+        return self.__class__.fromArrays(self.n, p, a, k, clean)
+
+    ##############
+    # Normalizer #
+    ##############
+
+    def cleanUpFactors(self):
+        """Put every braid of the batch in left normal form."""
+        if self.clean:
+            return
+        self.clean = True
+        n = self.n
+        a = self.a
+        rows = np.arange(len(a))
+        ident = np.arange(n)
+        # Sweep right to left over the rows that changed last time,
+        # exactly as Braid.cleanUpFactors does one braid at a time.
+        while len(rows) and a.shape[1] > 1:
+            changed = np.zeros(len(a), dtype=bool)
+            for j in range(a.shape[1] - 2, -1, -1):
+                m = meet(complement(a[rows, j]), a[rows, j + 1])
+                nz = (m != ident).any(axis=-1)
+                if nz.any():
+                    r = rows[nz]
+                    m = m[nz]
+                    a[r, j + 1] = multiply(invert(m), a[r, j + 1])
+                    a[r, j] = multiply(a[r, j], m)
+                    changed[r] = True
+            rows = np.nonzero(changed)[0]
+
+        # Cut out copies of D from the left
+        is_d = (a == delta(n)).all(axis=-1)
+        lead = np.cumprod(is_d, axis=1).sum(axis=1)
+        self.p = self.p + lead
+        index = np.arange(a.shape[1]) + lead[:, None]
+        pad = identity(n, (len(a), 1))
+        a = np.take_along_axis(
+            np.concatenate([a, pad], axis=1),
+            np.minimum(index, a.shape[1])[..., None], axis=1)
+        # Cut out the identity elements from the right
+        nontrivial = (a != ident).any(axis=-1)
+        self.k = np.zeros(len(a), dtype=np.intp)
+        if a.shape[1]:
+            self.k[:] = np.where(
+                nontrivial.any(axis=1),
+                a.shape[1] - np.argmax(nontrivial[:, ::-1], axis=1), 0)
+        self.a = a[:, :max(self.k, default=0)]
+
+    ###########
+    # Access  #
+    ###########
+
+    def __len__(self):
+        return len(self.p)
+
+    def row(self, i):
+        """Return (p, factors) of braid i, factors as a (k, n) array view."""
+        self.cleanUpFactors()
+        return int(self.p[i]), self.a[i, :self.k[i]]
+
+    def __getitem__(self, i):
+        p, a = self.row(i)
+        ans = Braid([CanonicalFactor(x.tolist()) for x in a], self.n, p)
+        ans.clean = True
+        return ans
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def toBraids(self):
+        return list(self)
+
+    ####################
+    # Group Arithmetic #
+    ####################
+
+    def tau(self, power=1):
+        """Conjugate every braid by D^power; the normal form is preserved."""
+        return self._copy(self.p, tau(self.a, power), self.k, self.clean)
+
+    def __invert__(self):
+        """Inverses of all braids of the batch."""
+        self.cleanUpFactors()
+        n, k = self.n, self.k
+        width = self.a.shape[1]
+        m = np.arange(width)
+        src = np.clip(k[:, None] - 1 - m, 0, None)
+        comp = complement(self.a)
+        if width:
+            comp = np.take_along_axis(comp, src[..., None], axis=1)
+        a = tau(comp, m - self.p[:, None] - k[:, None])
+        a[m >= k[:, None]] = np.arange(n)
+        return self._copy(-self.p - k, a, k, True)
+
+    def __mul__(self, other):
+        """Row by row products; other may be a batch or a single braid."""
+        if isinstance(other, Braid):
+            other = self.__class__([other] * len(self), self.n)
+        if not isinstance(other, BraidBatch) or self.n != other.n or len(self) != len(other):
+            return NotImplemented
+        k1, k2 = self.a.shape[1], other.a.shape[1]
+        left = tau(self.a, other.p[:, None])
+        pad = identity(self.n, (len(self), k1))
+        stack = np.concatenate([left, other.a, pad], axis=1)
+        # Place other's factors immediately after each row's own factors
+        j = np.arange(k1 + k2)
+        index = np.where(j < self.k[:, None], j, k1 + j - self.k[:, None])
+        a = np.take_along_axis(stack, index[..., None], axis=1)
+        return self._copy(self.p + other.p, a, self.k + other.k, False)
+
+    def conjugate(self, x):
+        """
+        x * b * ~x for every braid b of the batch, normalized together.
+
+        >>> batch = BraidBatch([[1, -2, 3], [2, 2, -1, -1], []], 5)
+        >>> x = Braid([2, 4, -1, -3], 5)
+        >>> all(y == b.conjugate(x) for y, b in zip(batch.conjugate(x), batch))
+        True
+
+        """
+        return self._conjugate(x, ~x)
+
+    def conjugate_inverse(self, x):
+        """~x * b * x for every braid b of the batch; see conjugate()."""
+        return self._conjugate(~x, x)
+
+    def _conjugate(self, left, right):
+        if not isinstance(left, Braid) or self.n != left.n:
+            raise TypeError('Incompatible operands')
+        # Products are joined without normalizing, so this is one pass
+        ans = self.__class__([left] * len(self), self.n) * self * right
+        ans.cleanUpFactors()
+        return ans
+
+    def equal(self, other):
+        """Row by row equality test, as a boolean array."""
+        self.cleanUpFactors()
+        other.cleanUpFactors()
+        width = max(self.a.shape[1], other.a.shape[1])
+
+        def _padded(x):
+            pad = identity(self.n, (len(x), width - x.shape[1]))
+            return np.concatenate([x, pad], axis=1)
+        return ((self.p == other.p) & (self.k == other.k) &
+                (_padded(self.a) == _padded(other.a)).all(axis=(1, 2)))
+
+    def __repr__(self):
+        return 'BraidBatch(%r, %s)' % (self.toBraids(), self.n)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,9 +1,12 @@
 #!/usr/bin/python
 
 import random
+from array import array
 from functools import reduce
 from sympy.combinatorics import Permutation
-from .canonical_factor import CanonicalFactor
+from .canonical_factor import CanonicalFactor, FrozenFactor
+from .braid_group import BraidGroup
+from . import burau
 
 
 class Braid:
@@ -17,14 +20,26 @@ class Braid:
         a: list of canonical factors
     """
 
-    _d = {}
-
     @classmethod
     def d(cls, n):
         """The fundamental factor D (lowercase delta here) in B_n."""
-        if n not in cls._d:
-            cls._d[n] = cls.CanonicalFactor([n - 1] + list(range(0, n - 1)))
-        return cls._d[n]
+        return CanonicalFactor(BraidGroup(n).D)
+
+    @classmethod
+    def delta_power(cls, n, p):
+        """
+        D^p in B_n, already in normal form.
+
+        >>> Braid.delta_power(5, -2) == Braid([-1, -2, -3, -4] * 2, 5)
+        True
+
+        """
+        return cls([], n, p)
+
+    @property
+    def group(self):
+        """The BraidGroup holding the factor tables for this width."""
+        return BraidGroup(self.n)
 
     @classmethod
     def random(cls, n=None, p=None):
@@ -54,6 +69,10 @@ class Braid:
 
     CanonicalFactor = CanonicalFactor
 
+    # Reject unequal braids by Burau fingerprint before normalizing;
+    # see fingerprint().  Needs numpy.
+    useFingerprints = False
+
     def __init__(self, obj=None, n=None, p=None, *args, **kwargs):
         """
         Initialize a braid.
@@ -96,14 +115,20 @@ class Braid:
             self.p = obj.p
             self.a = list(obj.a)
             self.clean = obj.clean
+            # Cached values describe the same element, so share them
+            for name in ('_key', '_fingerprint', '_circuit', '_summitSet',
+                         '_rightNormalForm', '_mixedForm', '_mixedTranspositions'):
+                if name in obj.__dict__:
+                    setattr(self, name, getattr(obj, name))
         elif isinstance(obj, list) and n is not None:
             self.n = n
             # Quick exit for identity elements and powers of D
             if not obj:
                 self.p = p or 0
                 self.a = []
+                self.clean = True
                 return
-            if isinstance(obj[0], Braid.CanonicalFactor):
+            if isinstance(obj[0], (Braid.CanonicalFactor, FrozenFactor)):
                 # A list of canonical factors? Copy so we can modify in place
                 if p is not None:
                     self.p = p
@@ -130,7 +155,7 @@ class Braid:
         if isinstance(obj[0], list):
             # Copy list of band generators so we can modify in place
             if len(obj[0]) == 2:
-                bandgens = list(obj)
+                bandgens = [list(x) for x in obj]
             else:
                 raise NotImplementedError
         else:
@@ -155,15 +180,26 @@ class Braid:
         # Don't forget to check the first (leftmost) generator!
         if bandgens[0][0] < bandgens[0][1]:
             self.p -= 1
-        self.a = [
-            Braid.CanonicalFactor.createFromPair(x, self.n)
-            for x in bandgens]
+        group = self.group
+        self.a = [group.band(*x) for x in bandgens]
 
     def cleanUpFactors(self):
         if self.clean:
             return
         self.clean = True
 
+        group = self.group
+        table = group.table
+        if table is not None:
+            # Integer-table left-weighting for small widths, when every
+            # factor is canonical; plain permutations take the sweep below
+            ranks = [table.rank.get(tuple(x.array_form)) for x in self.a]
+            if None not in ranks:
+                self.p += table.leftWeight(ranks)
+                # Copies, so the braid can't change the shared table
+                self.a = [CanonicalFactor(table.factors[r]) for r in ranks]
+                return
+
         leftmost = -1
         rightmost = len(self.a) - 2
         meets = [None] * len(self)
@@ -174,7 +210,7 @@ class Braid:
                 # But I think our permutations mean different things
                 # And the paper without pseudocode does it this way.
                 if meets[j] is None:
-                    meets[j] = (~self.a[j] * Braid.d(self.n)).meet(self.a[j + 1])
+                    meets[j] = group.leftMeet(self.a[j], self.a[j + 1])
                 if meets[j]:
                     # Shift b one factor to the left
                     newleft = j
@@ -203,11 +239,68 @@ class Braid:
             del self.a[-1]
             a_len -= 1
         # Cut out copies of D from the left
-        while a_len > 0 and self.a[0] == Braid.d(self.n):
+        while a_len > 0 and self.a[0] == group.D:
             del self.a[0]
             a_len -= 1
             self.p += 1
 
+    @staticmethod
+    def _leftWeightPair(group, a, j):
+        """
+        Make the pair a[j], a[j + 1] left-weighted, in place.
+        Returns True if the pair changed.
+        """
+        meet = group.leftMeet(a[j], a[j + 1])
+        if not meet:
+            return False
+        a[j + 1] = ~meet * a[j + 1]
+        a[j] = a[j] * meet
+        return True
+
+    @staticmethod
+    def _mergeLeftWeighted(group, a, s):
+        """
+        Left-weight a list of factors whose halves a[:s] and a[s:] are each
+        left-weighted, in place.
+
+        The shorter half is absorbed into the longer one a factor at a time.
+        Each absorbed factor is pushed across the longer half only while
+        the pairs it meets keep changing, so the work is bounded by how much
+        the normal form changes near the junction, not by len(a).
+        """
+        if s <= len(a) - s:
+            # Prepend the left factors, pushing changes to the right
+            for i in range(s - 1, -1, -1):
+                j = i
+                while j < len(a) - 1 and Braid._leftWeightPair(group, a, j):
+                    j += 1
+        else:
+            # Append the right factors, pushing changes to the left
+            for i in range(s, len(a)):
+                j = i - 1
+                while j >= 0 and Braid._leftWeightPair(group, a, j):
+                    j -= 1
+
+    @classmethod
+    def _fromLeftWeighted(cls, a, n, p):
+        """
+        Wrap a left-weighted list of factors (not copied) as a clean braid,
+        cutting identities from the right and copies of D from the left.
+        """
+        while a and not a[-1]:
+            del a[-1]
+        d = BraidGroup(n).D.array_form
+        lead = 0
+        while lead < len(a) and a[lead].array_form == d:
+            lead += 1
+        del a[:lead]
+        ans = cls.__new__(cls)
+        ans.n = n
+        ans.p = p + lead
+        ans.a = a
+        ans.clean = True
+        return ans
+
     ####################
     # Group Arithmetic #
     ####################
@@ -221,6 +314,15 @@ class Braid:
         >>> one * two == Braid([1, 2], 5)
         True
 
+        Products of normalized braids come out normalized
+        >>> x = Braid([5, 1, -2, 4, 3, -1, -2], 6)
+        >>> y = Braid([2, 2, -5, 1, 3], 6)
+        >>> x.cleanUpFactors(); y.cleanUpFactors()
+        >>> (x * y).clean
+        True
+        >>> str(x * y) == str(Braid([5, 1, -2, 4, 3, -1, -2, 2, 2, -5, 1, 3], 6))
+        True
+
         """
         # Shortcut for identity elements
         if not self:
@@ -234,18 +336,73 @@ class Braid:
         if not isinstance(other, Braid) or self.n != other.n:
             return NotImplemented
         # Combine information and construct the product
-        a = [x.tau(other.p) for x in self.a] + other.a
-        return Braid(a, n=self.n, p=self.p + other.p)
+        tau = self.group.tau
+        a = [tau(x, other.p) for x in self.a] + other.a
+        if self.clean and other.clean:
+            # Both halves are already left-weighted: only fix the junction
+            Braid._mergeLeftWeighted(self.group, a, self.k)
+            ans = Braid._fromLeftWeighted(a, self.n, self.p + other.p)
+        else:
+            ans = Braid(a, n=self.n, p=self.p + other.p)
+        # Burau fingerprints are multiplicative
+        try:
+            ans._fingerprint = burau.multiply(self._fingerprint, other._fingerprint)
+        except AttributeError:
+            pass
+        return ans
 
     def __pow__(self, exponent):
-        """Compute self^other."""
-        if exponent >= 0:
-            return reduce(
-                self.__class__.__mul__,
-                [self] * exponent,
-                self.__class__())
-        else:
-            return reduce(self.__class__.__mul__, [~self] * -exponent)
+        """
+        Compute self^exponent by repeated squaring.
+
+        >>> x = Braid([5, 1, -2, 4, 3, -1, -2], 6)
+        >>> x ** 5 == x * x * x * x * x
+        True
+        >>> x ** -3 == ~x * ~x * ~x
+        True
+
+        Powers of D and of periodic braids are found without squaring
+        >>> Braid([], 5, 2) ** 1000
+        B[5]([], 2000)
+        >>> Braid([1, 2, 3, 4], 5) ** 1002
+        B[5]([[2, 0, 1, 3, 4], [0, 3, 1, 2, 4], [0, 1, 4, 2, 3], [0, 1, 2, 4, 3], [0, 1, 2, 4, 3]], 1000)
+        >>> Braid([1, 2, 3, 4, 1], 5) ** -1001
+        B[5]([[0, 4, 1, 2, 3], [0, 4, 1, 2, 3], [0, 4, 1, 2, 3], [0, 1, 4, 2, 3]], -1254)
+
+        """
+        base = self if exponent >= 0 else ~self
+        exponent = abs(exponent)
+        base.cleanUpFactors()
+        if not base.a:
+            # Powers of D
+            return Braid([], base.n, base.p * exponent)
+        n = base.n
+        if exponent < n - 1:
+            return Braid._repeatedSquaring(base, exponent)
+        # A periodic braid has its (n-1)th or nth power a power of D
+        period = n - 1
+        power = Braid._repeatedSquaring(base, period)
+        if power.a:
+            period = n
+            power = power * base
+        quotient, remainder = divmod(exponent, period)
+        rest = Braid._repeatedSquaring(base, remainder)
+        if power.a:
+            return Braid._repeatedSquaring(power, quotient) * rest
+        # D^q on the left only changes p
+        return Braid._fromLeftWeighted(list(rest.a), n, rest.p + power.p * quotient)
+
+    @staticmethod
+    def _repeatedSquaring(base, exponent):
+        """base^exponent for exponent >= 0, by the binary method."""
+        ans = Braid([], base.n)
+        while exponent:
+            if exponent & 1:
+                ans = ans * base
+            exponent >>= 1
+            if exponent:
+                base = base * base
+        return ans
 
     def __invert__(self):
         """
@@ -254,18 +411,111 @@ class Braid:
         >>> x = Braid([5, 1, -2, 4, 3, -1, -2], 6)
         >>> not x * ~x
         True
+        >>> (~x).clean
+        True
 
         """
         # Shortcut for identity elements
         if not self:
             return Braid(self)
-        # Transform and reverse the list of canonical factors
-        d = Braid.d(self.n)
-        k = self.k
-        a = [(~self.a[i] * d).tau(-self.p - i - 1)
-             for i in range(k - 1, -1, -1)]
-        # Construct the inverse
-        return Braid(a, n=self.n, p=-self.p - k)
+        a, p = Braid._inverseFactors(self.group, self.a, self.p)
+        # Construct the inverse, which is in normal form if self was
+        ans = Braid(a, n=self.n, p=p)
+        ans.clean = self.clean
+        return ans
+
+    @staticmethod
+    def _inverseFactors(group, a, p):
+        """
+        Factors and power of the inverse of D^p a[0] ... a[-1]: the list of
+        factors transformed and reversed, left-weighted if a is.
+        """
+        k = len(a)
+        return ([group.tau(group.complement(a[i]), -p - i - 1)
+                 for i in range(k - 1, -1, -1)], -p - k)
+
+    def tau(self, power=1):
+        """
+        Conjugate by a power of D: D^{-power} self D^{power}.
+
+        Every factor goes to t^{power} of itself, so the normal form is kept.
+
+        >>> x = Braid([5, 1, -2, 4, 3, -1, -2], 6)
+        >>> d = Braid.delta_power(6, 1)
+        >>> x.tau(2) == d ** -2 * x * d ** 2
+        True
+        >>> x.tau(2).clean
+        True
+
+        """
+        tau = self.group.tau
+        ans = Braid([tau(x, power) for x in self.a], self.n, self.p)
+        ans.clean = self.clean
+        return ans
+
+    def conjugate(self, x):
+        """
+        x * self * ~x, normalized in one pass.
+
+        The factors of x, self and ~x are joined and left-weighted
+        together, without building the intermediate braids.
+
+        >>> b = Braid([1, -2, 3, 3, -4, 1], 5)
+        >>> x = Braid([2, 4, -1, -3], 5)
+        >>> b.conjugate(x) == x * b * ~x
+        True
+        >>> b.conjugate(x).clean
+        True
+        >>> d = Braid.delta_power(5, 1)
+        >>> b.conjugate(d) == d * b * ~d and b.conjugate_inverse(d) == ~d * b * d
+        True
+
+        """
+        if not isinstance(x, Braid) or self.n != x.n:
+            raise TypeError('Incompatible operands')
+        x.cleanUpFactors()
+        a, p = Braid._inverseFactors(x.group, x.a, x.p)
+        return self._conjugate(x.a, x.p, a, p)
+
+    def conjugate_inverse(self, x):
+        """
+        ~x * self * x, normalized in one pass; see conjugate().
+
+        >>> b = Braid([1, -2, 3, 3, -4, 1], 5)
+        >>> x = Braid([2, 4, -1, -3], 5)
+        >>> b.conjugate_inverse(x) == ~x * b * x
+        True
+
+        """
+        if not isinstance(x, Braid) or self.n != x.n:
+            raise TypeError('Incompatible operands')
+        x.cleanUpFactors()
+        a, p = Braid._inverseFactors(x.group, x.a, x.p)
+        return self._conjugate(a, p, x.a, x.p)
+
+    def _conjugate(self, left, leftPower, right, rightPower):
+        """
+        D^leftPower left * self * D^rightPower right, for left-weighted
+        lists of factors.
+        """
+        self.cleanUpFactors()
+        if not left and not right:
+            # Conjugation by a power of D
+            return self.tau(rightPower)
+        group = self.group
+        tau = group.tau
+        # self * right first, then the left factors pushed across it
+        a = [tau(x, rightPower) for x in self.a] + list(right)
+        Braid._mergeLeftWeighted(group, a, self.k)
+        # Copies of D at the front move past the left factors
+        lead = 0
+        while lead < len(a) and a[lead] == group.D:
+            lead += 1
+        del a[:lead]
+        power = self.p + rightPower + lead
+        a = [tau(x, power) for x in left] + a
+        Braid._mergeLeftWeighted(group, a, len(left))
+        return Braid._fromLeftWeighted(a, self.n, leftPower + power)
 
     def __eq__(self, other):
         """
@@ -284,7 +534,19 @@ class Braid:
         >>> Braid([1, 4, 4, 1], 7) == Braid([4, -5, 1, 1, 6, 4], 7)
         False
 
+        With fingerprints on, most unequal braids are told apart without
+        being normalized
+        >>> Braid.useFingerprints = True
+        >>> Braid([1, 4, 4, 1], 7) == Braid([4, -5, 1, 1, 6, 4], 7)
+        False
+        >>> Braid([1, 4, 4, 1], 7) == Braid([4, -5, 1, 1, 5, 4], 7)
+        True
+        >>> Braid.useFingerprints = False
+
         """
+        if (Braid.useFingerprints and isinstance(other, Braid) and self.n == other.n
+                and not burau.equal(self.fingerprint(), other.fingerprint())):
+            return False
         if other is 1 or not other:
             return not self
         if not isinstance(other, Braid):
@@ -295,12 +557,455 @@ class Braid:
         other.cleanUpFactors()
         return self.n == other.n and self.p == other.p and self.a == other.a
 
+    def key(self):
+        """
+        Canonical byte string of the normal form: n, p and the factor arrays.
+
+        Equal braids have equal keys.  Identity elements of every B_n share
+        the empty key, matching the quirk in __eq__.  Computed once per braid.
+
+        >>> Braid([1, 2, 1], 3).key() == Braid([2, 1, 2], 3).key()
+        True
+        >>> Braid([1, -1], 3).key() == Braid([], 5).key() == b''
+        True
+        >>> len({Braid([1, 3], 4), Braid([3, 1], 4), Braid([1], 4)})
+        2
+
+        """
+        try:
+            return self._key
+        except AttributeError:
+            pass
+        if not self:
+            self._key = b''
+        else:
+            flat = array('H')
+            for x in self.a:
+                flat.extend(x.array_form)
+            self._key = b'%d:%d:' % (self.n, self.p) + flat.tobytes()
+        return self._key
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def fingerprint(self):
+        """
+        The Burau matrix of this braid at a random point, mod a prime.
+
+        Equal braids have equal fingerprints, so differing fingerprints
+        prove two braids unequal, and fingerprint().tobytes() can bucket
+        braids before exact comparison.  No normalization is needed.
+        Computed once per braid; products of braids with fingerprints get
+        theirs by one matrix product.  Requires numpy.
+
+        >>> x, y = Braid([1, 2, 1], 3), Braid([-2, 1], 3)
+        >>> burau.equal(x.fingerprint(), Braid([2, 1, 2], 3).fingerprint())
+        True
+        >>> burau.equal(y.fingerprint(), x.fingerprint())
+        False
+        >>> z = x * y
+        >>> burau.equal(z._fingerprint, Braid([1, 2, 1, -2, 1], 3).fingerprint())
+        True
+
+        """
+        try:
+            return self._fingerprint
+        except AttributeError:
+            self._fingerprint = burau.braidMatrix(self)
+            return self._fingerprint
+
+    def __getstate__(self):
+        """
+        Pickle only the braid itself, not the cached values: fingerprints
+        use an evaluation point chosen per process, so they would not
+        match those of the process that unpickles the braid.
+
+        >>> import pickle
+        >>> x = Braid([1, 2, -1], 3)
+        >>> _ = x.fingerprint(), x.key()
+        >>> y = pickle.loads(pickle.dumps(x))
+        >>> y == x, [name for name in vars(y) if name.startswith('_')]
+        (True, [])
+
+        """
+        return dict((name, value) for name, value in self.__dict__.items()
+                    if not name.startswith('_'))
+
+    def freeze(self):
+        """
+        Normalize, then swap each factor for its interned FrozenFactor, in
+        place.  Returns self.
+
+        Frozen braids share one object per distinct factor, with its
+        complement, inverse and d_cycles computed once, so a large set of
+        braids over few factors costs little memory.  Arithmetic takes
+        frozen factors as it does CanonicalFactor ones; results are not
+        frozen until asked.
+
+        >>> x = Braid([1, 2], 4).freeze()
+        >>> y = Braid([1, 2, 2, 1], 4).freeze()
+        >>> x.a[1], y.a[1] is x.a[1]
+        (FrozenFactor([0, 2, 1, 3]), True)
+        >>> x * y == Braid([1, 2, 1, 2, 2, 1], 4)
+        True
+
+        """
+        self.cleanUpFactors()
+        self.a = [FrozenFactor(x) for x in self.a]
+        return self
+
     def __nonzero__(self):
         """Override the default boolean casting, since we have a fast way."""
         self.cleanUpFactors()
         return self.p != 0 or self.k != 0
     __bool__ = __nonzero__
 
+    ################################
+    # Lattice: prefixes and suffixes #
+    ################################
+
+    # x is a prefix of y when ~x * y is a positive braid (a product of
+    # band generators), and a suffix when y * ~x is.  Both orders make
+    # B_n a lattice.  Note that these are the orders of the band-generator
+    # monoid: lcm(sigma_1, sigma_2) is sigma_2 sigma_1 here, not the
+    # sigma_1 sigma_2 sigma_1 of the Artin monoid.
+
+    def _checkOperand(self, other):
+        if not isinstance(other, Braid) or self.n != other.n:
+            raise TypeError('Incompatible operands')
+        self.cleanUpFactors()
+        other.cleanUpFactors()
+
+    @staticmethod
+    def _remainder(group, factor, other):
+        """
+        The canonical factor c with factor * c the join (least common
+        multiple) of two canonical factors.  The join is D times the
+        inverse of the meet of their complements.
+        """
+        complement = group.complement(factor)
+        return complement * ~complement.meet(group.complement(other))
+
+    @staticmethod
+    def _complementLists(group, a, b):
+        """
+        For products of canonical factors x = a[0] a[1] ... and
+        y = b[0] b[1] ..., lists of factors for x \\ y and y \\ x, so that
+        x * (x \\ y) == y * (y \\ x) is the least common multiple.  This
+        fills in the len(a) by len(b) grid of factor joins.
+        """
+        b = list(b)
+        rest = []
+        for x in a:
+            for j, y in enumerate(b):
+                b[j], x = Braid._remainder(group, x, y), Braid._remainder(group, y, x)
+            rest.append(x)
+        return b, rest
+
+    def _positiveFactors(self, m):
+        """The factors of D^{-m} self, for m <= p, as a left-weighted list."""
+        d = self.group.D
+        return [CanonicalFactor(d) for _ in range(self.p - m)] + self.a
+
+    def is_prefix_of(self, other):
+        """
+        True if ~self * other is positive.
+
+        >>> Braid([1], 3).is_prefix_of(Braid([1, 2], 3))
+        True
+        >>> Braid([1], 3).is_prefix_of(Braid([2, 1], 3))
+        True
+        >>> Braid([1, 2], 3).is_prefix_of(Braid([1], 3))
+        False
+
+        """
+        self._checkOperand(other)
+        return (~self * other).inf() >= 0
+
+    def is_suffix_of(self, other):
+        """
+        True if other * ~self is positive.
+
+        >>> Braid([2], 3).is_suffix_of(Braid([1, 2], 3))
+        True
+        >>> Braid([-1], 3).is_suffix_of(Braid([2, -1], 3))
+        True
+
+        """
+        self._checkOperand(other)
+        return (other * ~self).inf() >= 0
+
+    def left_gcd(self, other):
+        """
+        The greatest common prefix of two braids.
+
+        Both are brought to D^m times a positive braid, m the smaller inf;
+        then the first factor of the gcd is the meet of their first
+        factors, which is removed from both, and so on.  Each step costs
+        one meet and two products with a canonical factor.
+
+        >>> x, y = Braid([1, 2, 1, 3], 4), Braid([1, 1, -3], 4)
+        >>> g = x.left_gcd(y)
+        >>> g.is_prefix_of(x) and g.is_prefix_of(y)
+        True
+        >>> Braid([1, 2, 3], 4).left_gcd(Braid([1, 2, 2], 4)) == Braid([1, 2], 4)
+        True
+
+        """
+        self._checkOperand(other)
+        n = self.n
+        m = min(self.p, other.p)
+        x = Braid._fromLeftWeighted(self._positiveFactors(m), n, 0)
+        y = Braid._fromLeftWeighted(other._positiveFactors(m), n, 0)
+        d = self.group.D
+        gcd = []
+        while True:
+            heads = [d if z.p else z.a[0] if z.a else None for z in (x, y)]
+            if None in heads:
+                break
+            head = heads[0].meet(heads[1])
+            if not head:
+                break
+            gcd.append(head)
+            head = Braid._simple(head)
+            x = ~head * x
+            y = ~head * y
+        return Braid._fromLeftWeighted(gcd, n, m)
+
+    def left_lcm(self, other):
+        """
+        The least common multiple on the right: the smallest braid with both
+        self and other as prefixes.
+
+        >>> x, y = Braid([1, 2, 1, 3], 4), Braid([1, 1, -3], 4)
+        >>> l = x.left_lcm(y)
+        >>> x.is_prefix_of(l) and y.is_prefix_of(l)
+        True
+        >>> Braid([1], 3).left_lcm(Braid([2], 3)) == Braid([2, 1], 3)
+        True
+
+        """
+        self._checkOperand(other)
+        m = min(self.p, other.p)
+        a = self._positiveFactors(m)
+        b = other._positiveFactors(m)
+        rest, _ = Braid._complementLists(self.group, a, b)
+        return Braid(a + rest, self.n, m)
+
+    def right_gcd(self, other):
+        """
+        The greatest common suffix.  Inversion turns suffixes into prefixes,
+        so this is the inverse of the lcm of the inverses.
+
+        >>> x, y = Braid([1, 2, 1, 3], 4), Braid([2, 2, 1, 3], 4)
+        >>> g = x.right_gcd(y)
+        >>> g.is_suffix_of(x) and g.is_suffix_of(y)
+        True
+        >>> g == Braid([2, 1, 3], 4)
+        True
+
+        """
+        self._checkOperand(other)
+        return ~(~self).left_lcm(~other)
+
+    def right_lcm(self, other):
+        """
+        The least common multiple on the left: the smallest braid with both
+        self and other as suffixes.
+
+        >>> x, y = Braid([1, 2, 1, 3], 4), Braid([1, 1, -3], 4)
+        >>> l = x.right_lcm(y)
+        >>> x.is_suffix_of(l) and y.is_suffix_of(l)
+        True
+
+        """
+        self._checkOperand(other)
+        return ~(~self).left_gcd(~other)
+
+    #############################
+    # Summit sets and conjugacy #
+    #############################
+
+    def inf(self):
+        """The largest r with D^r a prefix of this braid: p in normal form."""
+        self.cleanUpFactors()
+        return self.p
+
+    def sup(self):
+        """The smallest s with this braid a prefix of D^s: p + k."""
+        self.cleanUpFactors()
+        return self.p + self.k
+
+    @classmethod
+    def _simple(cls, factor):
+        """A canonical factor as a braid."""
+        return cls._fromLeftWeighted([factor], factor.n, 0)
+
+    def initialFactor(self):
+        """t^{-p}(A_1), so that D^p A_1 = t^{-p}(A_1) D^p; None if k = 0."""
+        self.cleanUpFactors()
+        if not self.a:
+            return None
+        return self.group.tau(self.a[0], -self.p)
+
+    def finalFactor(self):
+        """A_k; None if k = 0."""
+        self.cleanUpFactors()
+        return self.a[-1] if self.a else None
+
+    def cycling(self):
+        """
+        Move the initial factor to the end: D^p A_2 ... A_k t^{-p}(A_1).
+
+        This is the conjugate of self by initialFactor().
+
+        >>> x = Braid([1, -2, 3, 3, -4, 1, 2, 2], 5)
+        >>> c = Braid._simple(x.initialFactor())
+        >>> x.cycling() == ~c * x * c
+        True
+
+        """
+        self.cleanUpFactors()
+        if not self.a:
+            return Braid(self)
+        return Braid(self.a[1:] + [self.initialFactor()], self.n, self.p)
+
+    def decycling(self):
+        """
+        Move the final factor to the front: A_k D^p A_1 ... A_{k-1}.
+
+        This is the conjugate of self by the inverse of finalFactor().
+
+        >>> x = Braid([1, -2, 3, 3, -4, 1, 2, 2], 5)
+        >>> c = Braid._simple(x.finalFactor())
+        >>> x.decycling() == c * x * ~c
+        True
+
+        """
+        self.cleanUpFactors()
+        if not self.a:
+            return Braid(self)
+        last = self.group.tau(self.a[-1], self.p)
+        return Braid([last] + self.a[:-1], self.n, self.p)
+
+    def preferredPrefix(self):
+        """
+        The meet of the initial factor with the complement of the final
+        factor, the conjugator for cyclic sliding.
+        """
+        self.cleanUpFactors()
+        if not self.a:
+            return CanonicalFactor(self.group.identity)
+        return self.initialFactor().meet(self.group.complement(self.a[-1]))
+
+    def slide(self):
+        """
+        Cyclic sliding: the conjugate of self by preferredPrefix().
+
+        Iterated sliding always ends in a circuit, and every braid on
+        such a sliding circuit is in the super summit set; see
+        conjugacy.py.
+
+        >>> x = Braid([1, -2, 3, 3, -4, 1, 2, 2], 5)
+        >>> c = Braid._simple(x.preferredPrefix())
+        >>> x.slide() == ~c * x * c
+        True
+        >>> x.slide().inf() >= x.inf() and x.slide().sup() <= x.sup()
+        True
+
+        """
+        prefix = self.preferredPrefix()
+        if not prefix:
+            return Braid(self)
+        c = Braid._simple(prefix)
+        return ~c * self * c
+
+    ################################
+    # Right and mixed normal forms #
+    ################################
+
+    @staticmethod
+    def _rightWeightPair(group, a, j):
+        """
+        Make the pair a[j], a[j + 1] right-weighted, in place.
+        Returns True if the pair changed.
+
+        What moves from a[j] into a[j + 1] is the largest common suffix of
+        a[j] and D * ~a[j + 1].  For canonical factors a common suffix is
+        the same as a common prefix (both orders are refinement of the
+        non-crossing partitions), so this is t^{-1} of the left-weighting
+        meet of a[j + 1] with t(a[j]), and shares its cache.
+        """
+        meet = group.leftMeet(a[j + 1], group.tau(a[j], 1))
+        if not meet:
+            return False
+        meet = group.tau(meet, -1)
+        a[j] = a[j] * ~meet
+        a[j + 1] = meet * a[j + 1]
+        return True
+
+    def rightNormalForm(self):
+        """
+        The right normal form B_1 ... B_k D^p, as (factors, p), with every
+        pair B_i, B_{i+1} right-weighted: no suffix of B_i can move into
+        B_{i+1}.  p and k are those of the left normal form.
+
+        Braid operations return new braids, so this is computed once per
+        braid and kept.
+
+        >>> x = Braid([1, -2, 3, 3, -4, 1, 2, 2], 5)
+        >>> a, p = x.rightNormalForm()
+        >>> (len(a), p) == (x.k, x.p)
+        True
+        >>> d = Braid.delta_power(5, p)
+        >>> reduce(lambda y, z: y * Braid._simple(z), a, Braid([], 5)) * d == x
+        True
+
+        """
+        try:
+            return self._rightNormalForm
+        except AttributeError:
+            pass
+        self.cleanUpFactors()
+        group = self.group
+        # D^p A_1 ... A_k = t^{-p}(A_1) ... t^{-p}(A_k) D^p; right-weight
+        # the factors, prepending each and pushing changes to the right
+        a = [group.tau(x, -self.p) for x in self.a]
+        for i in range(len(a) - 2, -1, -1):
+            j = i
+            while j < len(a) - 1 and Braid._rightWeightPair(group, a, j):
+                j += 1
+        self._rightNormalForm = (tuple(a), self.p)
+        return self._rightNormalForm
+
+    def mixedForm(self):
+        """
+        The mixed canonical form ~N * P, as the positive braids (N, P).
+
+        For D^p A_1 ... A_k with p < 0, the first min(-p, k) factors go
+        with the negative powers of D into ~N and the rest make up P (see
+        D. Epstein, _Word Processing In Groups_ (1992), p. 198).
+        Computed once per braid, like rightNormalForm().
+
+        >>> x = Braid([1, -2, 3, 3, -4, 1, 2, 2, -1, -1], 5)
+        >>> N, P = x.mixedForm()
+        >>> ~N * P == x
+        True
+        >>> N.inf() >= 0 and P.inf() >= 0
+        True
+
+        """
+        try:
+            return self._mixedForm
+        except AttributeError:
+            pass
+        self.cleanUpFactors()
+        r = min(-self.p, self.k) if self.p < 0 else 0
+        negative = Braid._fromLeftWeighted(self.a[:r], self.n, min(self.p, 0))
+        positive = Braid._fromLeftWeighted(self.a[r:], self.n, max(self.p, 0))
+        self._mixedForm = (~negative, positive)
+        return self._mixedForm
+
     ###########
     # Helpers #
     ###########
@@ -361,15 +1066,10 @@ class Braid:
         """
         if self.n == 0:
             return NotImplemented
-        if 0 < i < self.n:
-            p = self.p
-            a = self.a + \
-                [Braid.CanonicalFactor.createFromPair([i + 1, i], self.n)]
-        elif -self.n < i < 0:
-            p = self.p - 1
-            a = [x.tau(-1) for x in self.a] + \
-                [Braid.CanonicalFactor.createFromPair([-i, 1 - i], self.n)]
-        return Braid(a, self.n, p)
+        from .builder import BraidBuilder
+        builder = BraidBuilder(self.n, self)
+        builder.append(i)
+        return builder.braid()
 
     ###########
     # Display #
@@ -399,16 +1099,47 @@ class Braid:
         return (d ** self.p) * right
 
     def numMixedTranspositions(self):
-        """ Number of transpositions in mixed canonical form. """
-        if self.p >= 0:
-            return (self.n - 1) * self.p + sum(a.numTranspositions()
-                                               for a in self.a)
-        elif self.p <= -self.k:
-            return (self.n - 1) * (-self.p) + sum(
-                self.n - 1 - a.numTranspositions() for a in self.a)
-        else:
-            return sum(self.n - 1 - a.numTranspositions()
-                       for a in self.a[:self.p]) + sum(a.numTranspositions() for a in self.a[self.p:])
+        """
+        Number of transpositions in mixed canonical form; see mixedForm().
+        Computed once per braid.
+
+        >>> Braid([-1, -2, -1], 3).numMixedTranspositions()
+        3
+        >>> Braid([1, -2, -2], 3).numMixedTranspositions()
+        3
+
+        """
+        try:
+            return self._mixedTranspositions
+        except AttributeError:
+            pass
+        self._mixedTranspositions = sum(
+            (self.n - 1) * x.p + sum(a.numTranspositions() for a in x.a)
+            for x in self.mixedForm())
+        return self._mixedTranspositions
+
+    def toString(self, form='left'):
+        """
+        The braid as a string in left or right normal form, or in mixed
+        canonical form; str() gives the left normal form.
+
+        >>> x = Braid([-1, 2], 3)
+        >>> x.toString('right')
+        '[3] [2, 1, 0] * [2, 1, 0] * D^(-1)'
+        >>> x.toString('mixed')
+        '[3] ~(D^(0) * [1, 0, 2]) * D^(0) * [0, 2, 1]'
+
+        """
+        if form == 'left':
+            return str(self)
+        if form == 'right':
+            a, p = self.rightNormalForm()
+            return '[%s] %s * D^(%s)' % (self.n, " * ".join(map(str, a)), p)
+        if form == 'mixed':
+            parts = [" * ".join(['D^(%s)' % x.p] + list(map(str, x.a)))
+                     for x in self.mixedForm()]
+            return '[%s] ~(%s) * %s' % (self.n, parts[0], parts[1])
+        raise ValueError('Unknown form: %r' % (form,))
 
     def __str__(self):
         '''
@@ -427,11 +1158,12 @@ class _BraidConstructorIndex:
     """
     >>> Braid([-3], 5) == B[5]([-3])
     True
+    >>> B[5] is BraidGroup(5)
+    True
     """
 
     def __getitem__(self, key):
-        return lambda obj=None, p=None, * \
-            args, **kwargs: Braid(obj, *args, n=key, p=p, **kwargs)
+        return BraidGroup(key)
 
 
 B = _BraidConstructorIndex()
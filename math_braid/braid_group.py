@@ -0,0 +1,255 @@
+#!/usr/bin/python
+
+"""
+Per-width context for braid arithmetic.
+
+Everything that depends only on the braid width n (the fundamental factor,
+the canonical factors of band generators, the index tables for tau and the
+identity) is built once per n and shared by every braid of that width.
+That includes a bounded LRU cache of left complements and of the meets
+that left-weighting computes, since the same factor pairs come up again
+and again across braids of one width.
+
+"""
+
+from array import array
+from collections import OrderedDict
+
+from .canonical_factor import CanonicalFactor, _complement, _tauMap
+
+
+def _key(factor):
+    """
+    A factor's array form as bytes, the cache key for its complement.
+
+    A pair of factors is keyed by the two keys one after the other; the
+    length tells the two kinds of key apart.
+    """
+    return array('H', factor.array_form).tobytes()
+
+
+class FactorCache:
+    """
+    A bounded least-recently-used cache with hit and miss counts.
+
+    >>> cache = FactorCache(2)
+    >>> cache.put('x', 1); cache.put('y', 2)
+    >>> cache.get('x')
+    1
+    >>> cache.put('z', 3)
+    >>> cache.get('y') is None
+    True
+    >>> cache.info()
+    {'hits': 1, 'misses': 1, 'size': 2, 'maxsize': 2}
+    >>> cache.resize(1); len(cache)
+    1
+
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """The value for key, or None, counting a hit or a miss."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store a value, dropping the least recently used over maxsize."""
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def resize(self, maxsize):
+        """Change the bound, dropping the oldest entries if needed."""
+        self.maxsize = maxsize
+        while len(self._data) > max(maxsize, 0):
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and reset the counts."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._data), 'maxsize': self.maxsize}
+
+
+class BraidGroup:
+    """
+    The braid group B_n, holding the factor tables for width n.
+
+    There is one BraidGroup per n, and B[n] is that object.
+
+    >>> G = BraidGroup(5)
+    >>> G is BraidGroup(5)
+    True
+    >>> G.D
+    CanonicalFactor([4, 0, 1, 2, 3])
+    >>> G.identity
+    CanonicalFactor([0, 1, 2, 3, 4])
+
+    Band generators and their negative forms are looked up, not rebuilt;
+    every accessor hands out a copy, so the cached factors can't be changed
+    through the braids built from them
+    >>> from .braid import Braid
+    >>> b = Braid([[5, 2]], 5)
+    >>> b.a[0][0] = 3
+    >>> G.band(5, 2)
+    CanonicalFactor([0, 4, 2, 3, 1])
+    >>> G.band(5, 2) is G.band(5, 2)
+    False
+    >>> G.band(2, 5) == CanonicalFactor.createFromPair([2, 5], 5)
+    True
+
+    >>> x = CanonicalFactor([0, 4, 2, 3, 1])
+    >>> G.tau(x, 3) == x.tau(3) and G.tau(x, -2) == x.tau(-2)
+    True
+    >>> G.complement(x) == ~x * G.D
+    True
+    >>> y = CanonicalFactor([1, 2, 0, 3, 4])
+    >>> G.leftMeet(x, y) == G.complement(x).meet(y)
+    True
+
+    Calling the group constructs braids
+    >>> G([-3, 1])
+    B[5]([[4, 0, 2, 1, 3], [1, 0, 2, 3, 4]], -1)
+
+    """
+
+    _groups = {}
+
+    # Default bound on the cached complements and meets, per width;
+    # 0 turns caching off
+    cacheSize = 8192
+
+    def __new__(cls, n):
+        try:
+            return cls._groups[n]
+        except KeyError:
+            pass
+        self = object.__new__(cls)
+        self.n = n
+        self.identity = CanonicalFactor(list(range(0, n)))
+        self.D = CanonicalFactor([n - 1] + list(range(0, n - 1)))
+        # Band generator factors, filled in on first use
+        self._bands = {}
+        self.cache = FactorCache(cls.cacheSize)
+        cls._groups[n] = self
+        return self
+
+    def __getnewargs__(self):
+        return (self.n,)
+
+    def __repr__(self):
+        return 'BraidGroup(%s)' % self.n
+
+    def __call__(self, obj=None, p=None, *args, **kwargs):
+        """Construct a braid in this group; see Braid.__init__."""
+        from .braid import Braid
+        return Braid(obj, *args, n=self.n, p=p, **kwargs)
+
+    @property
+    def table(self):
+        """The FactorTable for this width, if lookup tables are enabled."""
+        return CanonicalFactor._tables.get(self.n)
+
+    def band(self, t, s):
+        """
+        The canonical factor of the band generator a_{ts}.
+
+        For t < s this is the factor for D a_{st}^{-1},
+        as in CanonicalFactor.createFromPair.
+
+        """
+        try:
+            ans = self._bands[t, s]
+        except KeyError:
+            ans = self._bands[t, s] = CanonicalFactor.createFromPair([t, s], self.n)
+        return CanonicalFactor(ans)
+
+    def tau(self, factor, power=1):
+        """t^{power}(factor), using the precomputed index tables."""
+        power %= self.n or 1
+        if not power:
+            return CanonicalFactor(factor)
+        index, values = _tauMap(self.n, power)
+        array_form = factor.array_form
+        return CanonicalFactor([values[array_form[i]] for i in index])
+
+    def complement(self, factor):
+        """The left complement ~factor * D, cached."""
+        key = _key(factor)
+        ans = self.cache.get(key)
+        if ans is None:
+            ans = CanonicalFactor(_complement(factor.array_form))
+            self.cache.put(key, ans)
+        return CanonicalFactor(ans)
+
+    def leftMeet(self, left, right):
+        """
+        The meet of ~left * D with right, cached by the pair.
+
+        The pair left, right is left-weighted exactly when this is the
+        identity; otherwise it is what moves from right into left.
+        Each call counts as one hit or one miss.
+
+        >>> G = BraidGroup(4)
+        >>> G.clearCache()
+        >>> x = G.band(3, 1)
+        >>> _ = G.leftMeet(x, x), G.leftMeet(x, x)
+        >>> G.cacheInfo()['hits'], G.cacheInfo()['misses']
+        (1, 1)
+
+        """
+        key = _key(left) + _key(right)
+        ans = self.cache.get(key)
+        if ans is None:
+            # Not through complement(), which would count a second lookup
+            ans = CanonicalFactor(_complement(left.array_form)).meet(right)
+            self.cache.put(key, ans)
+        return CanonicalFactor(ans)
+
+    def cacheInfo(self):
+        """
+        Hit and miss counts and the size of this width's cache.
+
+        >>> G = BraidGroup(6)
+        >>> G.clearCache()
+        >>> from .braid import Braid
+        >>> b = Braid([1, 2, -3, 4, 5], 6)
+        >>> b * b * b == b ** 3 and G.cacheInfo()['hits'] > 0
+        True
+
+        """
+        return self.cache.info()
+
+    def clearCache(self):
+        """Empty this width's cache and reset its counts."""
+        self.cache.clear()
+
+    def resizeCache(self, maxsize):
+        """Bound this width's cache to maxsize entries; 0 turns it off."""
+        self.cache.resize(maxsize)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,162 @@
+#!/usr/bin/python
+
+"""
+Building braids from a stream of generators.
+
+Braid(word, n) needs the whole word as a list before it starts.  A
+BraidBuilder instead takes one Artin or band generator at a time and keeps
+the left normal form D^p A_1 ... A_k up to date, so words can be read from
+any iterator (a file, a generator expression) without being stored.
+
+Appending a negative generator a^{-1} = (a^{-1} D) D^{-1} moves a D^{-1}
+across every factor already absorbed, replacing each A_i by t^{-1}(A_i),
+and a cancellation can send a D to the front the other way.  Rather than
+rewrite the factors, the builder keeps a global shift and stamps each
+factor with the shift at the time it was stored; the actual factor is
+t^{shift - stamp}(stored factor).
+
+"""
+
+from .braid import Braid
+from .braid_group import BraidGroup
+
+
+class BraidBuilder:
+    """
+    A braid in B_n, built one generator at a time.
+
+    Generators are Artin generators (nonzero integers, -n < x < n) or band
+    generators (2-element lists [t, s]), as in Braid.__init__.
+
+    >>> word = [1, -2, 3, 3, -4, 1, 2, -1, -1]
+    >>> builder = BraidBuilder(5)
+    >>> builder.extend(iter(word))
+    >>> builder.braid() == Braid(word, 5)
+    True
+    >>> builder.braid().clean
+    True
+
+    Keep going after emitting a braid
+    >>> builder.append([5, 2])
+    >>> builder.append([2, 4])
+    >>> builder.braid() == Braid(word, 5) * Braid([[5, 2], [2, 4]], 5)
+    True
+
+    Start from an existing braid
+    >>> more = BraidBuilder(5, Braid(word, 5))
+    >>> more.extend(x for x in [-3, 2])
+    >>> more.braid() == Braid(word + [-3, 2], 5)
+    True
+
+    """
+
+    def __init__(self, n, braid=None):
+        self.n = n
+        self.group = BraidGroup(n)
+        self.p = 0
+        # Stored factors, their stamps and the current shift
+        self.a = []
+        self.stamps = []
+        self.shift = 0
+        # a[:lead] are copies of D, not yet moved into p
+        self.lead = 0
+        if braid is not None:
+            if braid.n != n:
+                raise TypeError('Incompatible operands')
+            braid.cleanUpFactors()
+            self.p = braid.p
+            self.a = list(braid.a)
+            self.stamps = [0] * len(self.a)
+
+    def __len__(self):
+        """Return the number of canonical factors absorbed so far."""
+        return len(self.a) - self.lead
+
+    def _factor(self, i):
+        return self.group.tau(self.a[i], self.shift - self.stamps[i])
+
+    def append(self, generator):
+        """Absorb one Artin or band generator."""
+        n = self.n
+        if isinstance(generator, int):
+            if 0 < generator < n:
+                t, s = generator + 1, generator
+            elif -n < generator < 0:
+                t, s = -generator, 1 - generator
+            else:
+                return
+        elif isinstance(generator, (list, tuple)) and len(generator) == 2:
+            t, s = generator
+        else:
+            raise NotImplementedError(repr(generator))
+        if t < s:
+            # a_{st}^{-1} = (a_{st}^{-1} D) D^{-1}
+            self.absorb(self.group.complement(self.group.band(s, t)))
+            self.p -= 1
+            self.shift -= 1
+        else:
+            self.absorb(self.group.band(t, s))
+
+    def extend(self, generators):
+        """Absorb every generator from an iterable."""
+        for x in generators:
+            self.append(x)
+
+    def absorb(self, factor):
+        """
+        Multiply on the right by a canonical factor.
+
+        The factor is pushed left only while the pairs it meets change.
+        """
+        group = self.group
+        d = group.D.array_form
+        a, stamps = self.a, self.stamps
+        a.append(factor)
+        stamps.append(self.shift)
+        right = factor
+        j = len(a) - 2
+        while j >= self.lead:
+            left = self._factor(j)
+            meet = group.leftMeet(left, right)
+            if not meet:
+                break
+            a[j + 1] = ~meet * right
+            stamps[j + 1] = self.shift
+            right = a[j] = left * meet
+            stamps[j] = self.shift
+            if right.array_form == d:
+                # From here on D just passes every factor A to its left,
+                # leaving t(A) behind.  Move it to the front and apply t
+                # by shifting the frame, keeping the factors to its right.
+                del a[j]
+                del stamps[j]
+                a.insert(self.lead, right)
+                stamps.insert(self.lead, self.shift)
+                for i in range(j + 1, len(a)):
+                    stamps[i] += 1
+                self.shift += 1
+                break
+            j -= 1
+
+        # Cut out the identity elements from the right
+        # and count copies of D on the left
+        while len(a) > self.lead and not a[-1]:
+            del a[-1]
+            del stamps[-1]
+        while self.lead < len(a) and a[self.lead].array_form == d:
+            self.lead += 1
+        if self.lead > len(a) // 2:
+            del a[:self.lead]
+            del stamps[:self.lead]
+            self.p += self.lead
+            self.lead = 0
+
+    def braid(self):
+        """The braid absorbed so far, in left normal form."""
+        a = [self._factor(i) for i in range(self.lead, len(self.a))]
+        return Braid._fromLeftWeighted(a, self.n, self.p + self.lead)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
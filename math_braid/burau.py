@@ -0,0 +1,146 @@
+#!/usr/bin/python
+
+"""
+Burau fingerprints of braids.
+
+The reduced Burau representation sends B_n to (n-1) x (n-1) matrices over
+Z[t, t^{-1}].  Evaluated at a random point t modulo a prime it is a cheap
+homomorphic fingerprint: equal braids always get equal matrices, and
+unequal braids almost never do (the representation is faithful for
+n <= 3, and a random evaluation point makes accidental collisions rare
+for every n in practice).  A matrix is computed straight from the factor
+list, normalized or not, and the matrix of a product is the product of
+the matrices, so fingerprints can reject unequal braids without running
+cleanUpFactors.
+
+Entries stay below 2^26, so products of n-1 terms fit in int64 for widths
+up to 2048.
+
+"""
+
+import functools
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from .canonical_factor import CanonicalFactor
+
+# Largest prime below 2^26, and the evaluation point for t
+PRIME = 67108859
+POINT = random.SystemRandom().randrange(2, PRIME - 1)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('Burau fingerprints require numpy')
+
+
+def identity(n):
+    """The identity matrix for B_n."""
+    _require_numpy()
+    return np.eye(max(n - 1, 0), dtype=np.int64)
+
+
+def _applyArtin(m, i, t=POINT):
+    """
+    Multiply m on the right by the matrix of sigma_i (or its inverse for
+    i < 0), in place.  Only three columns change.
+    """
+    r = abs(i) - 1
+    col = m[:, r].copy()
+    if i < 0:
+        t = pow(t, PRIME - 2, PRIME)
+    m[:, r] = col * (PRIME - t) % PRIME
+    if r > 0:
+        m[:, r - 1] = (m[:, r - 1] + col * (t if i > 0 else 1)) % PRIME
+    if r + 1 < m.shape[1]:
+        m[:, r + 1] = (m[:, r + 1] + col * (1 if i > 0 else t)) % PRIME
+
+
+def artinMatrix(word, n):
+    """
+    The matrix of a word in Artin generators.
+
+    >>> x = artinMatrix([1, 2, 1], 4)
+    >>> np.array_equal(x, artinMatrix([2, 1, 2], 4))
+    True
+    >>> np.array_equal(artinMatrix([1, 3, -1, -3], 4), identity(4))
+    True
+
+    """
+    m = identity(n)
+    for i in word:
+        _applyArtin(m, i)
+    return m
+
+
+@functools.lru_cache(maxsize=4096)
+def _factorMatrix(array_form):
+    m = artinMatrix(CanonicalFactor(list(array_form)).getArtinWord(), len(array_form))
+    m.flags.writeable = False
+    return m
+
+
+def factorMatrix(factor):
+    """
+    The matrix of a canonical factor, cached by array form.
+
+    >>> x = CanonicalFactor([0, 4, 2, 3, 1])
+    >>> np.array_equal(factorMatrix(x), artinMatrix([4, 3, 2, -3, -4], 5))
+    True
+
+    """
+    return _factorMatrix(tuple(factor.array_form))
+
+
+def multiply(x, y):
+    """Matrix product mod PRIME."""
+    return x @ y % PRIME
+
+
+def power(x, p):
+    """x^p mod PRIME for p >= 0, by repeated squaring."""
+    ans = np.eye(len(x), dtype=np.int64)
+    while p:
+        if p & 1:
+            ans = multiply(ans, x)
+        p >>= 1
+        if p:
+            x = multiply(x, x)
+    return ans
+
+
+def deltaPower(n, p):
+    """The matrix of D^p, with D = sigma_{n-1} ... sigma_1."""
+    if p >= 0:
+        return power(artinMatrix(list(range(n - 1, 0, -1)), n), p)
+    return power(artinMatrix(list(range(-1, -n, -1)), n), -p)
+
+
+def braidMatrix(braid):
+    """
+    The fingerprint matrix of D^p A_1 ... A_k.
+
+    >>> from .braid import Braid
+    >>> word = [1, -2, 3, 3, -4, 1, 2, -1, -1]
+    >>> np.array_equal(braidMatrix(Braid(word, 5)), artinMatrix(word, 5))
+    True
+
+    """
+    ans = deltaPower(braid.n, braid.p)
+    for x in braid.a:
+        ans = multiply(ans, factorMatrix(x))
+    return ans
+
+
+def equal(x, y):
+    """True if two fingerprints match."""
+    return np.array_equal(x, y)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -12,6 +12,10 @@ Lecture Notes in Computer Science (2001), 144--156.
 
 # This is compatible but the constructor of sympy Permutaton is too slow.
 # from sympy.combinatorics import Permutation
+
+import weakref
+from collections import OrderedDict
+
 from .permutation import Permutation
 
 
@@ -54,6 +58,12 @@ class CanonicalFactor(Permutation):
 
     """
 
+    # Lookup tables by width; see factor_table.FactorTable.enable
+    _tables = {}
+
+    # Fewest pairs of one width that meetMany stacks for the NumPy kernel
+    batchMin = 256
+
     @classmethod
     def createFromPair(cls, pair, n):
         """
@@ -86,17 +96,7 @@ class CanonicalFactor(Permutation):
     @classmethod
     def createFromDcycle(cls, d_cycles):
         # Convert the cycles back into a permutation
-        n = len(d_cycles)
-        prev = [-1] * n
-        lst = [-1] * n
-        for i in range(0, n):
-            if prev[d_cycles[i]] < 0:
-                lst[i] = d_cycles[i]
-            else:
-                lst[i] = prev[d_cycles[i]]
-            prev[d_cycles[i]] = i
-
-        new = cls(lst)
+        new = cls(_fromDcycles(d_cycles))
         new._d_cycles = d_cycles
         return new
 
@@ -111,14 +111,21 @@ class CanonicalFactor(Permutation):
         return "CanonicalFactor(%s)" % str(self)
 
     def __mul__(self, other):
+        if isinstance(other, FrozenFactor):
+            other = CanonicalFactor(other)
         return Permutation.__mul__(other, self)
 
     def __eq__(self, other):
         """Equality test."""
-        try:
-            other = self.__class__(other)
-        except NotImplementedError:
-            return NotImplemented
+        if isinstance(other, FrozenFactor):
+            if self.n == 0:
+                return not other
+            return self.array_form == list(other.array_form)
+        if not isinstance(other, CanonicalFactor):
+            try:
+                other = self.__class__(other)
+            except NotImplementedError:
+                return NotImplemented
 
         if other.n == 0:
             return self.n == 0 or self.array_form == list(range(0, self.n))
@@ -160,11 +167,26 @@ class CanonicalFactor(Permutation):
         True
         >>> x.tau(0) == x
         True
+        >>> x.tau(-12) == x.tau(2)
+        True
 
         """
-        return self.__class__([
-            (self.array_form[(i - power) % self.n] + power) % self.n
-            for i in range(0, self.n)])
+        return self.__class__(_tau(self.array_form, power))
+
+    def complement(self):
+        """
+        The left complement ~A * D, so that A * A.complement() == D.
+
+        >>> x = CanonicalFactor([0, 4, 2, 3, 1, 5, 6])
+        >>> x.complement() == ~x * CanonicalFactor([6, 0, 1, 2, 3, 4, 5])
+        True
+
+        """
+        return self.__class__(_complement(self.array_form))
+
+    def freeze(self):
+        """The interned, immutable FrozenFactor with the same array."""
+        return FrozenFactor(self)
 
     def numTranspositions(self):
         """
@@ -208,6 +230,25 @@ class CanonicalFactor(Permutation):
         ans.reverse()
         return ans
 
+    def getArtinWord(self):
+        """
+        Write a canonical factor in Artin generators, expanding each band
+        generator a_{ts} as s_{t-1} ... s_{s+1} s_s s_{s+1}^{-1} ... s_{t-1}^{-1}.
+
+        >>> from .braid import Braid
+        >>> x = CanonicalFactor([0, 4, 2, 3, 1])
+        >>> x.getArtinWord()
+        [4, 3, 2, -3, -4]
+        >>> Braid(x.getArtinWord(), 5) == Braid([[5, 2]], 5)
+        True
+
+        """
+        ans = []
+        for t, s in self.getTranspositions():
+            up = list(range(t - 1, s, -1))
+            ans.extend(up + [s] + [-i for i in reversed(up)])
+        return ans
+
     @property
     def d_cycles(self):
         """
@@ -226,10 +267,7 @@ class CanonicalFactor(Permutation):
         try:
             return self._d_cycles
         except AttributeError:
-            self._d_cycles = list(range(0, self.n))
-            for i in range(self.n - 1, -1, -1):
-                if self.array_form[i] < i:
-                    self._d_cycles[self.array_form[i]] = self._d_cycles[i]
+            self._d_cycles = _dCycles(self.array_form)
         return self._d_cycles
 
     def meet(self, other):
@@ -254,10 +292,11 @@ class CanonicalFactor(Permutation):
         """
         # These safeguards might not be necessary
         # Time cost is about 1 part in 50
-        try:
-            other = self.__class__(other)
-        except NotImplementedError:
-            return NotImplemented
+        if not isinstance(other, (CanonicalFactor, FrozenFactor)):
+            try:
+                other = self.__class__(other)
+            except NotImplementedError:
+                return NotImplemented
 
         # Shortcut for an identity element
         if self.n == 0 or other.n == 0:
@@ -265,24 +304,403 @@ class CanonicalFactor(Permutation):
         if self.n != other.n:
             return NotImplemented
 
-        self_d_cycles = self.d_cycles
-        other_d_cycles = other.d_cycles
-        # This part isn't written exactly as given in the paper
-        # That version seemed to have a few confusing redundancies
-        # Specifically, switching between 1...n and n...1 unnecessarily
-        order = list(range(0, self.n))
-        order.sort(key=lambda x: (self_d_cycles[x], other_d_cycles[x]))
-        order.reverse()
-
-        j = order[0]
-        d_cycles = [j] * self.n
-        for x in order[1:]:
-            if self_d_cycles[j] != self_d_cycles[x] or other_d_cycles[j] != other_d_cycles[x]:
-                j = x
-            d_cycles[x] = j
+        table = self._tables.get(self.n)
+        if table is not None:
+            m = table.meet[table.rankOf(self) * table.size + table.rankOf(other)]
+            return self.__class__(table.factors[m])
 
+        d_cycles = _meetDcycles(self.d_cycles, other.d_cycles)
         return self.__class__.createFromDcycle(d_cycles)
 
+    @classmethod
+    def meetMany(cls, lefts, rights):
+        """
+        The meets of many factor pairs in one call, as
+        [x.meet(y) for x, y in zip(lefts, rights)].
+
+        Pairs are grouped by width.  A width with a lookup table is read
+        from it; otherwise, with NumPy available, the pairs of a width are
+        stacked and met in one pass of the vectorized kernel in batch.py,
+        which pays off from a few hundred pairs of factors whose d_cycles
+        aren't cached yet.  Fewer than batchMin pairs, or no NumPy, go
+        through meet one by one.
+
+        >>> one = CanonicalFactor([0, 4, 2, 3, 1, 6, 5])
+        >>> two = CanonicalFactor([0, 4, 3, 2, 1, 5, 6])
+        >>> CanonicalFactor.meetMany([one, two, one], [two, two, CanonicalFactor()])
+        [CanonicalFactor([0, 4, 2, 3, 1, 5, 6]), CanonicalFactor([0, 4, 3, 2, 1, 5, 6]), CanonicalFactor([])]
+        >>> CanonicalFactor.meetMany([one.freeze()], [[0, 4, 3, 2, 1, 5, 6]])
+        [CanonicalFactor([0, 4, 2, 3, 1, 5, 6])]
+        >>> CanonicalFactor.meetMany([one] * 300, [two] * 300) == [one.meet(two)] * 300
+        True
+
+        """
+        from . import batch
+        ans = []
+        widths = {}
+        for x, y in zip(lefts, rights):
+            if not isinstance(x, (CanonicalFactor, FrozenFactor)):
+                x = cls(x)
+            if not isinstance(y, (CanonicalFactor, FrozenFactor)):
+                y = cls(y)
+            n = x.n
+            if n == 0 or y.n == 0:
+                ans.append(cls())
+                continue
+            if n != y.n:
+                raise TypeError('Incompatible operands')
+            widths.setdefault(n, []).append((len(ans), x, y))
+            ans.append(None)
+        for n, pairs in widths.items():
+            table = cls._tables.get(n)
+            if table is not None:
+                size, rankOf = table.size, table.rankOf
+                for k, x, y in pairs:
+                    ans[k] = cls(table.factors[table.meet[rankOf(x) * size + rankOf(y)]])
+            elif batch.np is not None and len(pairs) >= cls.batchMin:
+                xs = batch.np.array([x.array_form for _, x, _ in pairs])
+                ys = batch.np.array([y.array_form for _, _, y in pairs])
+                for (k, _, _), row in zip(pairs, batch.meet(xs, ys).tolist()):
+                    ans[k] = cls(row)
+            else:
+                for k, x, y in pairs:
+                    ans[k] = cls.createFromDcycle(_meetDcycles(x.d_cycles, y.d_cycles))
+        return ans
+
+
+class FrozenFactor:
+    """
+    Immutable, interned canonical factor.
+
+    There is exactly one FrozenFactor per width n and array while it is in
+    use, so equality between frozen factors is an identity check and they
+    can be used as dict keys.  The identity always has its full width-n
+    array (FrozenFactor(1, n)); there is no width-0 form.  The inverse,
+    left complement, d_cycles and numTranspositions are cached on the
+    instance, so each is computed once per distinct factor.
+
+    The intern table holds factors weakly, and the keepSize most recently
+    created ones strongly, so at large widths memory stays bounded while
+    factors in use keep their cached values.
+
+    FrozenFactor is opt-in: Braid.freeze() swaps a braid's factors for
+    their frozen forms, so that braids share them, while arithmetic and
+    BraidGroup go on building CanonicalFactor lists.
+
+    >>> x = FrozenFactor([0, 1, 3, 2, 4])
+    >>> x is FrozenFactor((0, 1, 3, 2, 4)) is CanonicalFactor([0, 1, 3, 2, 4]).freeze()
+    True
+    >>> x == CanonicalFactor([0, 1, 3, 2, 4]) and CanonicalFactor([0, 1, 3, 2, 4]) == x
+    True
+    >>> CanonicalFactor(x)
+    CanonicalFactor([0, 1, 3, 2, 4])
+    >>> CanonicalFactor([0, 3, 2, 1, 4]).meet(x)
+    CanonicalFactor([0, 1, 2, 3, 4])
+    >>> {x: 'x'}[FrozenFactor([0, 1, 3, 2, 4])]
+    'x'
+    >>> x == (0, 1, 3, 2, 4) or x == [0, 1, 3, 2, 4]
+    False
+    >>> ~x is x
+    True
+    >>> x.meet(FrozenFactor([0, 3, 2, 1, 4]))
+    FrozenFactor([0, 1, 2, 3, 4])
+    >>> x * x is FrozenFactor([0, 1, 2, 3, 4])
+    True
+    >>> x.array_form = (0, 1, 2, 3, 4)
+    Traceback (most recent call last):
+        ...
+    AttributeError: FrozenFactor is immutable
+
+    One identity per width
+    >>> e = FrozenFactor(1, 5)
+    >>> e is FrozenFactor([0, 1, 2, 3, 4]) is x.meet([]) is x.meet(FrozenFactor([0, 3, 2, 1, 4]))
+    True
+    >>> x * CanonicalFactor() is x and e.tau(2) is e
+    True
+
+    """
+
+    __slots__ = (
+        'array_form', '_d_cycles', '_inverse', '_complement',
+        '_numTranspositions', '__weakref__')
+
+    # Every factor in use, by (n, array), and the most recent ones kept
+    # alive with their cached values
+    _interned = weakref.WeakValueDictionary()
+    _recent = OrderedDict()
+    keepSize = 65536
+
+    def __new__(cls, obj=None, n=None):
+        """
+        The factor for a list, tuple or Permutation; identities (1, an
+        empty list, a width-0 CanonicalFactor) need their width n.
+        """
+        if isinstance(obj, FrozenFactor):
+            if n is not None and obj.n != n:
+                raise TypeError('Incompatible operands')
+            return obj
+        if isinstance(obj, Permutation):
+            array_form = tuple(obj.array_form)
+        elif isinstance(obj, int) or not obj:
+            array_form = ()
+        else:
+            array_form = tuple(obj)
+        if not array_form:
+            if not n:
+                raise ValueError('The identity FrozenFactor needs its width n')
+            array_form = tuple(range(0, n))
+        elif n is not None and len(array_form) != n:
+            raise TypeError('Incompatible operands')
+        key = (len(array_form), array_form)
+        self = cls._interned.get(key)
+        if self is None:
+            self = object.__new__(cls)
+            object.__setattr__(self, 'array_form', array_form)
+            cls._interned[key] = self
+            recent = cls._recent
+            recent[key] = self
+            if len(recent) > cls.keepSize:
+                recent.popitem(last=False)
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenFactor is immutable')
+    __delattr__ = __setattr__
+
+    def _cache(self, name, value):
+        object.__setattr__(self, name, value)
+        return value
+
+    def __reduce__(self):
+        return (self.__class__, (self.array_form,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @classmethod
+    def createFromPair(cls, pair, n):
+        """See CanonicalFactor.createFromPair."""
+        return cls(CanonicalFactor.createFromPair(pair, n))
+
+    @classmethod
+    def createFromDcycle(cls, d_cycles):
+        new = cls(_fromDcycles(d_cycles))
+        try:
+            new._d_cycles
+        except AttributeError:
+            new._cache('_d_cycles', tuple(d_cycles))
+        return new
+
+    def thaw(self):
+        """A mutable CanonicalFactor with the same array."""
+        return CanonicalFactor(list(self.array_form))
+
+    ##############################
+    # Make it behave like a list #
+    ##############################
+
+    @property
+    def n(self):
+        return len(self.array_form)
+    size = n
+
+    def __len__(self):
+        return len(self.array_form)
+
+    def __getitem__(self, key):
+        return self.array_form[key]
+
+    def __iter__(self):
+        return iter(self.array_form)
+
+    def __str__(self):
+        return str(list(self.array_form))
+
+    def __repr__(self):
+        return "FrozenFactor(%s)" % str(self)
+
+    ####################
+    # Group Arithmetic #
+    ####################
+
+    def __eq__(self, other):
+        """
+        Equality test: identity between frozen factors.  Anything else is
+        left to the other operand (CanonicalFactor compares arrays), so
+        equal hashable objects always have equal hashes.
+        """
+        if isinstance(other, FrozenFactor):
+            return self is other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = object.__hash__
+
+    def __bool__(self):
+        """Nonzero test: False for identity factors."""
+        return any(i != j for i, j in enumerate(self.array_form))
+    __nonzero__ = __bool__
+
+    def __mul__(self, other):
+        """Same product order as CanonicalFactor."""
+        other = FrozenFactor(other, self.n)
+        if not other:
+            return self
+        mine = self.array_form
+        return FrozenFactor([mine[i] for i in other.array_form])
+
+    def __invert__(self):
+        try:
+            return self._inverse
+        except AttributeError:
+            mapping = [0] * self.n
+            for i, j in enumerate(self.array_form):
+                mapping[j] = i
+            inverse = self._cache('_inverse', FrozenFactor(mapping))
+            if inverse is not self:
+                inverse._cache('_inverse', self)
+            return inverse
+
+    def tau(self, power=1):
+        """See CanonicalFactor.tau."""
+        if not self:
+            return self
+        return FrozenFactor(_tau(self.array_form, power))
+
+    def complement(self):
+        """The left complement ~A * D, computed once per factor."""
+        try:
+            return self._complement
+        except AttributeError:
+            return self._cache('_complement', FrozenFactor(_complement(self.array_form)))
+
+    def numTranspositions(self):
+        """See CanonicalFactor.numTranspositions."""
+        try:
+            return self._numTranspositions
+        except AttributeError:
+            return self._cache('_numTranspositions', sum(
+                1 for i, v in enumerate(self.array_form) if v < i))
+
+    def getTranspositions(self):
+        """See CanonicalFactor.getTranspositions."""
+        return CanonicalFactor.getTranspositions(self)
+
+    def getArtinWord(self):
+        """See CanonicalFactor.getArtinWord."""
+        return CanonicalFactor.getArtinWord(self)
+
+    @property
+    def d_cycles(self):
+        """See CanonicalFactor.d_cycles, as a tuple."""
+        try:
+            return self._d_cycles
+        except AttributeError:
+            return self._cache('_d_cycles', tuple(_dCycles(self.array_form)))
+
+    def meet(self, other):
+        """See CanonicalFactor.meet."""
+        other = FrozenFactor(other, self.n)
+        if self is other:
+            return self
+        return FrozenFactor.createFromDcycle(
+            _meetDcycles(self.d_cycles, other.d_cycles))
+
+
+###########################################################
+# Kernels on plain int sequences, for storage modes that  #
+# don't keep one CanonicalFactor object per factor        #
+###########################################################
+
+
+def _dCycles(array_form):
+    """Maxima of the descending cycles of a factor given as a sequence."""
+    n = len(array_form)
+    d_cycles = list(range(0, n))
+    for i in range(n - 1, -1, -1):
+        if array_form[i] < i:
+            d_cycles[array_form[i]] = d_cycles[i]
+    return d_cycles
+
+
+def _fromDcycles(d_cycles):
+    """Convert descending-cycle maxima back into an array form."""
+    n = len(d_cycles)
+    prev = [-1] * n
+    lst = [-1] * n
+    for i in range(0, n):
+        if prev[d_cycles[i]] < 0:
+            lst[i] = d_cycles[i]
+        else:
+            lst[i] = prev[d_cycles[i]]
+        prev[d_cycles[i]] = i
+    return lst
+
+
+# Index maps for t^k by (n, k)
+_tauMaps = {}
+
+
+def _tauMap(n, power):
+    """
+    Index maps (index, values) with t^{power}(A)[i] = values[A[index[i]]].
+
+    Built once per width and power, for 0 < power < n.
+    """
+    try:
+        return _tauMaps[n, power]
+    except KeyError:
+        ans = _tauMaps[n, power] = (
+            [(i - power) % n for i in range(0, n)],
+            [(v + power) % n for v in range(0, n)])
+        return ans
+
+
+def _tau(array_form, power):
+    """t^{power} of a factor given as a sequence (see CanonicalFactor.tau)."""
+    n = len(array_form)
+    power %= n or 1
+    if not power:
+        return list(array_form)
+    index, values = _tauMap(n, power)
+    return [values[array_form[i]] for i in index]
+
+
+def _complement(array_form):
+    """The left complement ~A * D of a factor given as a sequence."""
+    n = len(array_form)
+    ans = [0] * n
+    for i, j in enumerate(array_form):
+        ans[(j + 1) % n] = i
+    return ans
+
+
+def _meetDcycles(self_d_cycles, other_d_cycles):
+    """
+    Descending-cycle maxima of the meet of two factors.
+
+    Indices i and j share a cycle of the meet exactly when they share a
+    cycle of both factors, and the maximum of each such class is the first
+    index of the class met on a scan from the top.  One pass with a dict
+    keyed by the pair of maxima does it in linear time.
+
+    >>> _meetDcycles([0, 4, 2, 3, 4, 6, 6], [0, 4, 3, 3, 4, 5, 6])
+    [0, 4, 2, 3, 4, 5, 6]
+
+    """
+    n = len(self_d_cycles)
+    first = {}
+    d_cycles = [first.setdefault(self_d_cycles[x] * n + other_d_cycles[x], x)
+                for x in range(n - 1, -1, -1)]
+    d_cycles.reverse()
+    return d_cycles
+
 
 if __name__ == '__main__':
     import doctest
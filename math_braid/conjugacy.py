@@ -0,0 +1,278 @@
+#!/usr/bin/python
+
+"""
+The conjugacy problem in B_n, by sliding circuits.
+
+Cyclic sliding (Braid.slide) conjugates a braid by its preferred prefix
+without raising inf or lowering sup, and iterating it always ends in a
+circuit.  Braids on sliding circuits lie in the super summit set (SSS),
+the conjugates with the largest inf and smallest sup, and two braids are
+conjugate exactly when the sliding circuits of one contain the circuit
+element reached from the other.
+
+The SSS is connected by minimal simple conjugators: from each element z,
+each band generator a extends to the smallest simple s >= a with z^s in
+the SSS (the set of such s is closed under meets), and following these
+edges from any element reaches them all.  The minimal s is found by
+growing s with the join-based remainders of the Franco-Gonzalez-Meneses
+argument until neither inf nor sup moves; no enumeration of simple
+elements is needed.  To stay on sliding circuits, each neighbour found
+this way is slid onto its circuit.  That is not the transport and
+pullback construction of the minimal conjugators between sliding
+circuits, so it need not reach every circuit: a query it does not answer
+falls back to exploring the whole SSS, which the minimal simple
+conjugators do connect, before the answer is no.
+
+Results are cached on the braids themselves: each braid keeps the
+sliding circuit element it reaches, and a target braid keeps the part of
+its sliding circuits explored so far, so repeated queries against the
+same target only slide the query and look it up.
+
+Conventions: x^c = ~c * x * c, and conjugator(x, y) returns c with
+x^c == y.
+
+"""
+
+from collections import deque
+
+from .braid import Braid
+
+
+def _minimalSimple(z, inverse, factor):
+    """
+    The smallest simple s >= factor with inf(z^s) >= inf(z) and
+    sup(z^s) <= sup(z), given z and its inverse in normal form.
+
+    inf(z^s) >= r for z = D^r x means t^r(s) <= x * s; while that fails
+    s grows by the remainder of x * s and t^r(s), and sup(z^s) <= sup(z)
+    is the same condition for the inverse.
+    """
+    group = z.group
+    s = factor
+    changed = True
+    while changed:
+        changed = False
+        for w in (z, inverse):
+            remainder = group.tau(s, w.p)
+            for x in w.a + [s]:
+                remainder = Braid._remainder(group, x, remainder)
+                if not remainder:
+                    break
+            if remainder:
+                s = s * remainder
+                changed = True
+    return s
+
+
+def slidingCircuit(braid):
+    """
+    A braid on the sliding circuit that iterated cyclic sliding of braid
+    ends in, and the conjugator to it: (z, c) with braid^c == z.
+    Computed once per braid.
+
+    >>> x = Braid([1, -2, 3, 3, -4, 1, 2, 2], 5)
+    >>> z, c = slidingCircuit(x)
+    >>> ~c * x * c == z
+    True
+    >>> slidingCircuit(z.slide())[0] in [z, z.slide(), z.slide().slide()]
+    True
+
+    """
+    try:
+        return braid._circuit
+    except AttributeError:
+        pass
+    z = Braid(braid)
+    seen = {}
+    path = []
+    prefixes = []
+    while z.key() not in seen:
+        seen[z.key()] = len(path)
+        path.append(z)
+        prefix = Braid._simple(z.preferredPrefix())
+        prefixes.append(prefix.a)
+        z = z.conjugate_inverse(prefix)
+    # One normalization for the conjugator, not one per slide
+    i = seen[z.key()]
+    c = Braid([x for a in prefixes[:i] for x in a], braid.n, 0)
+    braid._circuit = (path[i], c)
+    return braid._circuit
+
+
+class SummitSet:
+    """
+    The sliding circuits (or, with circuits=False, the whole super summit
+    set) of a braid, explored as far as queries need; widen() turns the
+    former into the latter.
+
+    elements maps the key of each element z found so far to (z, c),
+    with base^c == z, where base is the sliding circuit element of the
+    braid.  Neighbours are found through minimal simple conjugators; for
+    sliding circuits each neighbour is slid onto its circuit and the
+    whole circuit is added, which keeps the search to the much smaller
+    set of sliding circuits.
+
+    >>> x = Braid([1, -2, -2, 3, 1], 4)
+    >>> sss = SummitSet(x, circuits=False)
+    >>> sss.complete()
+    >>> len(sss)
+    64
+    >>> sc = SummitSet(x)
+    >>> sc.complete()
+    >>> len(sc)
+    16
+    >>> all(~c * sc.base * c == z for z, c in sc.elements.values())
+    True
+    >>> set(sc.elements) <= set(sss.elements)
+    True
+    >>> sc.widen()
+    >>> sc.complete()
+    >>> set(sc.elements) == set(sss.elements)
+    True
+
+    """
+
+    def __init__(self, braid, circuits=True):
+        self.n = braid.n
+        self.circuits = circuits
+        self.base, self.conjugator = slidingCircuit(braid)
+        self.elements = {}
+        # Elements whose neighbours are not yet known
+        self.queue = deque()
+        self._add(self.base, Braid([], self.n))
+
+    def __len__(self):
+        return len(self.elements)
+
+    def _add(self, z, c, s=None):
+        """
+        Add z, with base^(c * s) == z; for sliding circuits, slide z until
+        it reaches a known element or closes a new circuit, and add that
+        whole circuit.  c * s is only computed if something is added.
+        """
+        if not self.circuits:
+            if z.key() not in self.elements:
+                self.elements[z.key()] = (z, c if s is None else c * s)
+                self.queue.append(z)
+            return
+        seen = {}
+        path = []
+        while z.key() not in seen:
+            if z.key() in self.elements:
+                return
+            seen[z.key()] = len(path)
+            prefix = Braid._simple(z.preferredPrefix())
+            path.append((z, prefix))
+            z = z.conjugate_inverse(prefix)
+        i = seen[z.key()]
+        if s is not None:
+            c = c * s
+        if i:
+            c = c * Braid([x for _, prefix in path[:i] for x in prefix.a], self.n, 0)
+        for z, prefix in path[i:]:
+            self.elements[z.key()] = (z, c)
+            self.queue.append(z)
+            c = c * prefix
+
+    def _expand(self, z):
+        group = z.group
+        inverse = ~z
+        c = self.elements[z.key()][1]
+        conjugators = set()
+        for t in range(2, self.n + 1):
+            for s in range(1, t):
+                conjugators.add(tuple(_minimalSimple(z, inverse, group.band(t, s)).array_form))
+        for s in conjugators:
+            s = Braid._simple(Braid.CanonicalFactor(list(s)))
+            self._add(z.conjugate_inverse(s), c, s)
+
+    def find(self, key):
+        """
+        The (z, c) entry for the element with this key, exploring further
+        until it turns up; None if it is not in the set.
+        """
+        while key not in self.elements and self.queue:
+            self._expand(self.queue.popleft())
+        return self.elements.get(key)
+
+    def complete(self):
+        """Explore the whole set."""
+        while self.queue:
+            self._expand(self.queue.popleft())
+
+    def widen(self):
+        """
+        Go on to the whole super summit set, keeping the elements found so
+        far; every one of them is expanded again without sliding.
+        """
+        if not self.circuits:
+            return
+        self.circuits = False
+        self.queue = deque(z for z, _ in self.elements.values())
+
+
+def summitSet(braid):
+    """The sliding circuits of a braid as a SummitSet, kept on the braid."""
+    try:
+        return braid._summitSet
+    except AttributeError:
+        braid._summitSet = SummitSet(braid)
+        return braid._summitSet
+
+
+def conjugator(x, y):
+    """
+    A braid c with ~c * x * c == y, or None if x and y are not conjugate.
+
+    The sliding circuits of y are explored and cached on y, so asking
+    about many braids against the same y is cheap.  A braid not found on
+    them is looked for in the whole super summit set of y before the
+    answer is None.
+
+    >>> x = Braid([1, 2, -3, 2], 4)
+    >>> g = Braid([3, -1, 2, 2, -3], 4)
+    >>> y = ~g * x * g
+    >>> c = conjugator(x, y)
+    >>> ~c * x * c == y
+    True
+    >>> conjugator(x, Braid([1, 2, 2, -3], 4)) is None
+    True
+
+    """
+    if x.n != y.n:
+        raise TypeError('Incompatible operands')
+    z, c1 = slidingCircuit(x)
+    target = summitSet(y)
+    base = target.base
+    # inf and sup are the same all over a super summit set
+    if z.inf() != base.inf() or z.sup() != base.sup():
+        return None
+    entry = target.find(z.key())
+    if entry is None and target.circuits:
+        # The sliding circuits were searched by sliding neighbours in the
+        # SSS, which need not reach them all; the SSS itself is connected
+        target.widen()
+        entry = target.find(z.key())
+    if entry is None:
+        return None
+    # x^c1 == z == base^g and y^c2 == base
+    g = entry[1]
+    return c1 * ~g * ~target.conjugator
+
+
+def is_conjugate(x, y):
+    """
+    True if y = ~c * x * c for some braid c.
+
+    >>> is_conjugate(Braid([1, 2, 2], 3), Braid([2, 1, 1], 3))
+    True
+    >>> is_conjugate(Braid([1, 2], 3), Braid([1, -2], 3))
+    False
+
+    """
+    return conjugator(x, y) is not None
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
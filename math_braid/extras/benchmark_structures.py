@@ -0,0 +1,92 @@
+#!/usr/bin/python
+
+"""
+Compare the band-generator (Braid) and classical (ArtinBraid) Garside
+structures on a few kinds of input.
+
+Run as: python -m math_braid.extras.benchmark_structures [repeats]
+
+For each width and kind of word, prints the mean canonical length k of
+each structure, the time to build the normal form from the word, and the
+time to multiply two normal forms.
+
+"""
+
+from __future__ import print_function, division
+import random
+import sys
+import time
+
+from ..artin import ArtinBraid
+from ..builder import BraidBuilder
+from ..canonical_factor import CanonicalFactor
+
+
+def _artinWord(n, length):
+    return [random.choice([1, -1]) * random.randint(1, n - 1)
+            for _ in range(0, length)]
+
+
+def _positiveWord(n, length):
+    return [random.randint(1, n - 1) for _ in range(0, length)]
+
+
+def _bandWord(n, length):
+    return [sorted(random.sample(range(1, n + 1), 2), reverse=random.random() < .5)
+            for _ in range(0, length)]
+
+
+KINDS = [
+    ('artin', _artinWord),
+    ('positive', _positiveWord),
+    ('band', _bandWord),
+]
+
+
+def _band(word, n):
+    builder = BraidBuilder(n)
+    builder.extend(word)
+    return builder.braid()
+
+
+def _classical(word, n):
+    if word and isinstance(word[0], list):
+        # Expand band generators a_{ts}^{+-1} into Artin generators
+        artin = []
+        for t, s in word:
+            x = CanonicalFactor.createFromPair([max(t, s), min(t, s)], n).getArtinWord()
+            artin.extend(x if t > s else [-i for i in reversed(x)])
+        word = artin
+    return ArtinBraid(word, n)
+
+
+def _measure(build, words, n):
+    start = time.time()
+    braids = [build(w, n) for w in words]
+    built = time.time() - start
+    start = time.time()
+    for x, y in zip(braids, braids[1:]):
+        x * y
+    multiplied = time.time() - start
+    k = sum(b.k for b in braids) / len(braids)
+    return k, built, multiplied
+
+
+def main(repeats=20, widths=(4, 8, 16), length=60):
+    random.seed(0)
+    print('%4s %-9s %20s %20s %20s' % (
+        'n', 'input', 'k band/classical', 'build s', 'multiply s'))
+    for n in widths:
+        for name, f in KINDS:
+            words = [f(n, length) for _ in range(0, repeats)]
+            band = _measure(_band, words, n)
+            classical = _measure(_classical, words, n)
+            print('%4s %-9s %20s %20s %20s' % (
+                n, name,
+                '%.1f/%.1f' % (band[0], classical[0]),
+                '%.3f/%.3f' % (band[1], classical[1]),
+                '%.3f/%.3f' % (band[2], classical[2])))
+
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:2]])
@@ -118,6 +118,56 @@ def complexity_mixed(lst):
     return sum(b.numMixedTranspositions() for b in lst)
 
 
+# The complexities above are sums over the list, so when a Hurwitz move
+# replaces two adjacent braids the new total only needs those two.
+
+def complexity_canonical_update(total, old, new):
+    """
+    complexity_canonical of a list after the braids old in it are replaced
+    by new, given its previous complexity total.
+
+    >>> lst = [Braid([1, 2], 4), Braid([3, -1], 4), Braid([-2, -2], 4)]
+    >>> new = [lst[0] * lst[1] * ~lst[0], lst[0]]
+    >>> total = complexity_canonical(lst)
+    >>> complexity_canonical_update(total, lst[:2], new) == complexity_canonical(new + lst[2:])
+    True
+
+    """
+    return total - complexity_canonical(old) + complexity_canonical(new)
+
+
+def complexity_transpositions_update(total, old, new):
+    """
+    complexity_transpositions after replacing old by new; see
+    complexity_canonical_update.
+    """
+    return total - complexity_transpositions(old) + complexity_transpositions(new)
+
+
+def complexity_mixed_update(total, old, new):
+    """
+    complexity_mixed after replacing old by new; see
+    complexity_canonical_update.
+
+    >>> lst = [Braid([1, 2], 4), Braid([3, -1], 4), Braid([-2, -2], 4)]
+    >>> new = [lst[1], ~lst[1] * lst[0] * lst[1]]
+    >>> total = complexity_mixed(lst)
+    >>> complexity_mixed_update(total, lst[:2], new) == complexity_mixed(new + lst[2:])
+    True
+
+    """
+    return total - complexity_mixed(old) + complexity_mixed(new)
+
+
+# Incremental forms of the complexity functions, used by the searches in
+# extras.simplify
+COMPLEXITY_UPDATES = {
+    complexity_canonical: complexity_canonical_update,
+    complexity_transpositions: complexity_transpositions_update,
+    complexity_mixed: complexity_mixed_update,
+}
+
+
 def randomBraid(n=None):
     """Returns a random braid with 5-20 strands and 1-100 twists."""
     if n is None:
@@ -5,9 +5,15 @@
 from __future__ import print_function, division
 
 import random
-import collections
+import collections.abc
+import hashlib
+import multiprocessing
+import time
 import operator
-from .braidextras import complexity_mixed, lineout
+from .braidextras import COMPLEXITY_UPDATES, complexity_mixed, lineout
+from ..braid import Braid
+from ..braid_group import FactorCache
+from ..packed import PackedBraid
 
 
 def factorization_twist(factors, i):
@@ -18,15 +24,31 @@ def factorization_twist(factors, i):
 
     """
     if i > 0:  # positive twist
-        factors[i - 1:i + 1] = [factors[i - 1] *
-                                factors[i] * ~factors[i - 1], factors[i - 1]]
+        factors[i - 1:i + 1] = [_conjugate(factors[i], factors[i - 1]),
+                                factors[i - 1]]
     else:  # negative twist
         factors[-i - 1:-i + 1] = [factors[-i],
-                                  ~factors[-i] * factors[-i - 1] * factors[-i]]
+                                  _conjugate(factors[-i - 1], factors[-i], True)]
 
 
-class Search(collections.Iterator):
-    """Base class for searches."""
+def _conjugate(y, x, inverse=False):
+    """x * y * ~x, or ~x * y * x if inverse; in one pass for braids."""
+    if isinstance(y, Braid):
+        return y.conjugate_inverse(x) if inverse else y.conjugate(x)
+    return ~x * y * x if inverse else x * y * ~x
+
+
+class Search(collections.abc.Iterator):
+    """
+    Base class for searches.
+
+    The f_update keyword argument, f_update(total, old, new), gives the
+    complexity of a factorization from that of its neighbour and the two
+    factors a move changed; by default the incremental form of
+    f_complexity in COMPLEXITY_UPDATES, if any, so a step costs the same
+    however long the factorization is.
+
+    """
 
     def __init__(
             self,
@@ -39,80 +61,331 @@ class Search(collections.Iterator):
         self.factors = factors
         self.f_complexity = f_complexity
         self.bias = bias
+        self.f_update = kwargs.get('f_update')
+        if self.f_update is None:
+            self.f_update = COMPLEXITY_UPDATES.get(f_complexity)
         # Some properties for storing results
         self.complexity_map = {}
 
+    def __next__(self):
+        return self.next()
+
+    def _move_complexity(self, total, factors, newfactors, i):
+        """
+        Complexity of newfactors, which is Hurwitz move <i> applied to
+        factors, whose complexity is total.
+        """
+        if self.f_update is None:
+            return self.f_complexity(newfactors)
+        # Either move changes the factors at abs(i) - 1 and abs(i)
+        j = abs(i) - 1
+        return self.f_update(total, factors[j:j + 2], newfactors[j:j + 2])
+
+
+class IndexedHeap(object):
+    """
+    A max-heap of keys by weight, with an index so that the weight of a
+    queued key can be changed in O(log n).
+
+    >>> heap = IndexedHeap()
+    >>> heap.push('a', 1.0); heap.push('b', 3.0); heap.push('c', 2.0)
+    >>> heap.update('a', 4.0)
+    >>> [heap.pop() for _ in range(len(heap))]
+    [('a', 4.0), ('b', 3.0), ('c', 2.0)]
+
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.index = {}
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def weight(self, key):
+        return self.heap[self.index[key]][0]
+
+    def push(self, key, weight):
+        self.heap.append([weight, key])
+        self.index[key] = len(self.heap) - 1
+        self._up(len(self.heap) - 1)
+
+    def update(self, key, weight):
+        i = self.index[key]
+        old = self.heap[i][0]
+        self.heap[i][0] = weight
+        if weight > old:
+            self._up(i)
+        else:
+            self._down(i)
+
+    def pop(self):
+        """Remove the heaviest key; returns (key, weight)."""
+        heap = self.heap
+        weight, key = heap[0]
+        last = heap.pop()
+        del self.index[key]
+        if heap:
+            heap[0] = last
+            self.index[last[1]] = 0
+            self._down(0)
+        return key, weight
+
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.index[heap[i][1]] = i
+        self.index[heap[j][1]] = j
+
+    def _up(self, i):
+        heap = self.heap
+        while i and heap[(i - 1) // 2][0] < heap[i][0]:
+            self._swap(i, (i - 1) // 2)
+            i = (i - 1) // 2
+
+    def _down(self, i):
+        heap = self.heap
+        while True:
+            largest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap) and heap[child][0] > heap[largest][0]:
+                    largest = child
+            if largest == i:
+                return
+            self._swap(i, largest)
+            i = largest
+
+
+def factorization_key(factors):
+    """
+    A short digest identifying a factorization of braids; a PackedBraid
+    gives the same digest as the equal Braid.
+
+    >>> factors = [Braid([1, 2], 4), Braid([3, -1], 4)]
+    >>> factorization_key([PackedBraid(x) for x in factors]) == factorization_key(factors)
+    True
+
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for x in factors:
+        key = x.key() if isinstance(x, (Braid, PackedBraid)) else str(x).encode()
+        digest.update(b'%d:' % len(key))
+        digest.update(key)
+    return digest.digest()
+
+
+def conjugation_representative(factors):
+    """
+    A canonical one of the conjugates of a factorization of braids by
+    powers of D, all factors at once: the one whose list of factor keys is
+    least.  Conjugating every factor by the same power of D gives the same
+    representative.
+
+    D^n is central in B_n, so there are at most n conjugates, and usually
+    the first factor alone picks one out.
+    """
+    if not factors:
+        return []
+    powers = range(0, factors[0].n or 1)
+    for x in factors:
+        keys = dict((k, x.tau(k).key()) for k in powers)
+        least = min(keys.values())
+        powers = [k for k in powers if keys[k] == least]
+        if len(powers) == 1:
+            break
+    return [x.tau(powers[0]) for x in factors]
+
+
+def conjugation_key(factors):
+    """
+    factorization_key of conjugation_representative: equal for two
+    factorizations that differ by conjugating every factor by the same
+    power of D.  Searches can key their states by this instead.
+
+    >>> factors = [Braid([1, 2], 4), Braid([3, -1], 4), Braid([-2, 3], 4)]
+    >>> d = Braid.delta_power(4, 3)
+    >>> conjugation_key([~d * x * d for x in factors]) == conjugation_key(factors)
+    True
+    >>> conjugation_key(factors[::-1]) == conjugation_key(factors)
+    False
+
+    """
+    return factorization_key(conjugation_representative(factors))
+
+
+def conjugation_invariant(factors):
+    """
+    Invariants of a factorization of braids under conjugating every factor
+    by the same braid: for each factor its exponent sum in band generators
+    and the cycle type of its permutation.  Factorizations with different
+    invariants are never conjugate, so this is a cheap prefilter before
+    anything more thorough.
+
+    >>> factors = [Braid([1, 2], 4), Braid([3, -1], 4), Braid([-2, 3], 4)]
+    >>> c = Braid([2, -3, 1, 1], 4)
+    >>> conjugation_invariant([~c * x * c for x in factors]) == conjugation_invariant(factors)
+    True
+    >>> conjugation_invariant([Braid([1, 1], 4)]) == conjugation_invariant([Braid([1, 2], 4)])
+    False
+
+    """
+    ans = []
+    for x in factors:
+        x.cleanUpFactors()
+        n = x.n
+        d = x.group.D.array_form
+        # Permutation of D^p A_1 ... A_k, composed as CanonicalFactor does
+        perm = list(range(0, n))
+        for a in reversed([d] * (x.p % (n or 1)) + [y.array_form for y in x.a]):
+            perm = [a[i] for i in perm]
+        cycles = []
+        seen = [False] * n
+        for i in range(0, n):
+            length = 0
+            while not seen[i]:
+                seen[i] = True
+                i = perm[i]
+                length += 1
+            if length:
+                cycles.append(length)
+        ans.append(((n - 1) * x.p + sum(y.numTranspositions() for y in x.a),
+                    tuple(sorted(cycles))))
+    return tuple(ans)
+
+
+def _moveBit(i, n):
+    """
+    The bit for Hurwitz move i of n factors: moves 1 to n - 1 take bits 0
+    to n - 2, and moves -1 to 1 - n the n - 1 bits after them.
+
+    >>> sum(_moveBit(i, 4) for i in (1, 2, 3, -1, -2, -3)) == 2 ** 6 - 1
+    True
+    """
+    return 1 << (i - 1 if i > 0 else n - 2 - i)
+
+
+class _State(object):
+    """A factorization found by WeightSearch, stored by how it was reached."""
+    __slots__ = ('parent', 'move', 'complexity', 'skip')
+
+    def __init__(self, parent, move, complexity, skip):
+        self.parent = parent
+        self.move = move
+        self.complexity = complexity
+        # Moves not to try from here, those leading back to known states,
+        # as a bitmask of _moveBit
+        self.skip = skip
+
 
 class WeightSearch(Search):
+    """
+    Best-first search over Hurwitz moves, expanding the factorization of
+    largest weight next.
+
+    The queue of unexplored factorizations is an IndexedHeap, and each
+    factorization is kept only as its parent, the move from there and
+    its complexity, under a digest of its factors: factorization_key, or
+    the f_key keyword argument, e.g. conjugation_key to treat conjugates
+    by powers of D as one state.  Factors are rebuilt on demand by replaying moves from the nearest
+    factorization in an LRU cache (cache_size keyword argument, 4096
+    entries by default), so a smaller cache trades memory for replays.
+
+    """
+
     def __init__(self, *args, **kwargs):
         super(WeightSearch, self).__init__(*args, **kwargs)
         self.n = len(self.factors)
-        self.default_moves = set(range(1 - self.n, 0) + range(1, self.n))
-        self.best = {
-            'complexity': self.f_complexity(self.factors),
-            'factors': list(self.factors),
-            'moves_to_try': set(self.default_moves),
-            'moves_to_get_here': [],
-            'weight': 1.0,
-            'key': str(self.factors),
+        self.default_moves = set(range(1 - self.n, 0)) | set(range(1, self.n))
+        self.f_key = kwargs.get('f_key', factorization_key)
+        self.root = self.f_key(self.factors)
+        self.states = {
+            self.root: _State(None, None, self.f_complexity(self.factors), 0),
         }
-        # Collections of factorizations
-        self.finished = {}
-        self.unfinished = {
-            str(self.factors): self.best,
+        self.frontier = IndexedHeap()
+        self.frontier.push(self.root, 1.0)
+        self.cache = FactorCache(kwargs.get('cache_size', 4096))
+        self.explored = 0
+        self.best_key = self.root
+
+    def factors_of(self, key):
+        """The factorization stored under key."""
+        if key == self.root:
+            return list(self.factors)
+        moves = []
+        factors = self.cache.get(key)
+        while factors is None:
+            state = self.states[key]
+            moves.append(state.move)
+            key = state.parent
+            factors = self.factors if key == self.root else self.cache.get(key)
+        factors = list(factors)
+        for i in reversed(moves):
+            factorization_twist(factors, i)
+        return factors
+
+    def moves_to(self, key):
+        """The moves from the starting factorization to the one at key."""
+        moves = []
+        while key != self.root:
+            state = self.states[key]
+            moves.append(state.move)
+            key = state.parent
+        return moves[::-1]
+
+    @property
+    def best(self):
+        state = self.states[self.best_key]
+        return {
+            'complexity': state.complexity,
+            'factors': self.factors_of(self.best_key),
+            'moves_to_get_here': self.moves_to(self.best_key),
+            'key': self.best_key,
         }
 
     def next(self):
         # Anything left to explore?
-        if len(self.unfinished) == 0:
+        if not self.frontier:
             raise StopIteration('Accessible factorizations exhausted.')
 
-        # Select the top-weighted factorization; maybe would be more efficient
-        # as a heap.
-        curinfo = max(self.unfinished.itervalues(), key=lambda x: x['weight'])
+        # Select the top-weighted factorization
+        key, weight = self.frontier.pop()
+        current = self.states[key]
+        factors = self.factors_of(key)
         # Try all moves from this factorization
-        for i in curinfo['moves_to_try']:
-            newfactors = list(curinfo['factors'])
+        for i in self.default_moves:
+            if current.skip & _moveBit(i, self.n):
+                continue
+            newfactors = list(factors)
             factorization_twist(newfactors, i)
+            new_key = self.f_key(newfactors)
+            state = self.states.get(new_key)
+            if state is not None and new_key not in self.frontier:
+                # Already explored
+                continue
             # Compute complexity and weight.
-            new_key = str(newfactors)
-            if new_key not in self.finished:
-                new_complexity = self.f_complexity(newfactors)
-                new_weight = curinfo['weight'] * \
-                    self.bias ** (curinfo['complexity'] - new_complexity)
-                # If this is completely new to us, store some info.
-                if new_key not in self.unfinished:
-                    self.unfinished[new_key] = {
-                        'complexity': new_complexity,
-                        'factors': newfactors,
-                        'moves_to_try': self.default_moves - set([-i]),
-                        'moves_to_get_here': curinfo['moves_to_get_here'] + [i],
-                        'weight': new_weight,
-                        'key': new_key,
-                    }
-
-                    # Update our record of the best factorization.
-                    if new_complexity < self.best['complexity']:
-                        self.best = self.unfinished[new_key]
-                # If it's already in our 'unfinished' pile, update weight and
-                # moves.
-                else:
-                    if new_key != curinfo['key']:
-                        self.unfinished[new_key]['weight'] += new_weight
-                        self.unfinished[new_key]['moves_to_try'].discard(-i)
+            new_complexity = self._move_complexity(
+                current.complexity, factors, newfactors, i)
+            new_weight = weight * self.bias ** (current.complexity - new_complexity)
+            # If this is completely new to us, store it.
+            if state is None:
+                self.states[new_key] = _State(
+                    key, i, new_complexity, _moveBit(-i, self.n))
+                self.frontier.push(new_key, new_weight)
+                self.cache.put(new_key, newfactors)
+                # Update our record of the best factorization.
+                if new_complexity < self.states[self.best_key].complexity:
+                    self.best_key = new_key
+            # If it's already queued, update weight and moves.
             else:
-                # Indicates a bug; we should have already explored this one.
-                lineout(
-                    '%s, %s, %s\n' %
-                    (self.finished[new_key]['moves_to_get_here'],
-                     curinfo['moves_to_get_here'],
-                        i))
+                self.frontier.update(new_key, self.frontier.weight(new_key) + new_weight)
+                state.skip |= _moveBit(-i, self.n)
 
-        # We're done with this one; move it into the "finished" pile.
-        self.finished[curinfo['key']] = curinfo
-        del self.unfinished[curinfo['key']]
-
-        return self.best['complexity']
+        # We're done with this one.
+        self.explored += 1
+        return self.states[self.best_key].complexity
 
     def run(self, update_interval=10, stop_at=None):
         counter = update_interval
@@ -125,26 +398,27 @@ class WeightSearch(Search):
                 if counter == 0:
                     counter = update_interval
                     lineout('Explored %s factorizations (%s queued)' %
-                            (len(self.finished), len(self.unfinished)))
+                            (self.explored, len(self.frontier)))
                 if complexity < current_complexity:
                     lineout(
                         'New best complexity: %s at %s\n    %s\n' %
-                        (self.best['complexity'], len(
-                            self.finished), self.best['moves_to_get_here']))
+                        (complexity, self.explored, self.moves_to(self.best_key)))
                     current_complexity = complexity
                 if stop_at is not None and complexity <= stop_at:
                     break
         except KeyboardInterrupt:
             lineout('Interrupted.\n')
-        lineout('Total of %s factorizations explored.\n' % len(self.finished))
+        lineout('Total of %s factorizations explored.\n' % self.explored)
 
 
 class RandSearch(Search):
     def __init__(self, *args, **kwargs):
         super(RandSearch, self).__init__(*args, **kwargs)
         self.n = len(self.factors)
-        self.default_moves = range(1 - self.n, 0) + range(1, self.n)
+        self.default_moves = list(range(1 - self.n, 0)) + list(range(1, self.n))
         self.positive_only = kwargs.get('positive_only', False) and True
+        # Source of randomness: a random.Random for reproducible chains
+        self.rng = kwargs.get('rng', random)
         # Best factorization seen so far
         self.best = {
             'complexity': self.f_complexity(self.factors),
@@ -159,17 +433,18 @@ class RandSearch(Search):
         }
 
     def next(self):
-        i = random.choice(self.default_moves)
+        i = self.rng.choice(self.default_moves)
         if self.positive_only:
             i = abs(i)
         newfactors = list(self.current['factors'])
         factorization_twist(newfactors, i)
         # Calculuate complexities
-        new_complexity = self.f_complexity(newfactors)
+        new_complexity = self._move_complexity(
+            self.current['complexity'], self.current['factors'], newfactors, i)
         diff_complexity = self.current['complexity'] - new_complexity
         # Accept a transformation that decreases complexity
         # Or with probability bias**diff_complexity, one that increases it.
-        if diff_complexity > 0 or random.random() < self.bias**diff_complexity:
+        if diff_complexity > 0 or self.rng.random() < self.bias**diff_complexity:
             self.current['complexity'] = new_complexity
             self.current['factors'] = newfactors
             self.current['moves_to_get_here'].append(i)
@@ -209,6 +484,308 @@ class RandSearch(Search):
             lineout('Interrupted.\n')
 
 
+def _advance_chain(task):
+    """
+    Run one RandSearch chain of a TemperedSearch for some steps, from the
+    chain's state; returns the new state.  Runs in a worker process.
+    """
+    chain, f_complexity, positive_only, steps = task
+    rng = random.Random()
+    rng.setstate(chain['rng_state'])
+    search = RandSearch(chain['factors'], f_complexity=f_complexity,
+                        bias=chain['bias'], positive_only=positive_only, rng=rng)
+    search.current['moves_to_get_here'] = list(chain['moves_to_get_here'])
+    search.best = dict(chain['best'])
+    for _ in range(0, steps):
+        search.next()
+    return dict(chain,
+                factors=search.current['factors'],
+                complexity=search.current['complexity'],
+                moves_to_get_here=search.current['moves_to_get_here'],
+                best=search.best,
+                rng_state=rng.getstate())
+
+
+class TemperedSearch(object):
+    """
+    Parallel tempering: RandSearch chains at several biases, run side by
+    side in a process pool, that exchange factorizations every
+    swap_interval steps.
+
+    A larger bias is a colder chain, less willing to accept moves that
+    raise the complexity.  Adjacent chains i, j swap factorizations with
+    probability (bias_i / bias_j) ** (complexity_i - complexity_j) (or
+    always, if that is at least 1), so good factorizations drift to cold
+    chains while hot chains keep exploring.
+
+    Chain i draws its moves from random.Random('<seed>/<i>'), so runs with
+    the same seed, biases and step budget are the same however many
+    processes they use.  Without a seed, a fresh one is drawn and kept as
+    self.seed, so a run can still be repeated.  f_complexity must be picklable, e.g. a module
+    level function; processes=1 runs every chain in this process.
+
+    >>> factors = [Braid([1, 2], 4), Braid([3, -1], 4), Braid([-2, 3], 4)]
+    >>> search = TemperedSearch(factors, biases=(1.5, 3.0), seed=1, processes=1)
+    >>> best = search.run(steps=40)
+    >>> best['complexity'] <= complexity_mixed(factors)
+    True
+    >>> replay = list(factors)
+    >>> for i in best['moves_to_get_here']:
+    ...     factorization_twist(replay, i)
+    >>> replay == best['factors']
+    True
+    >>> TemperedSearch(factors, biases=(1.5, 3.0), seed=1, processes=1).run(steps=40) == best
+    True
+
+    """
+
+    def __init__(self, factors, biases=(1.25, 1.5, 2.0, 3.0),
+                 f_complexity=complexity_mixed, seed=None, swap_interval=100,
+                 processes=None, positive_only=False):
+        self.factors = list(factors)
+        self.f_complexity = f_complexity
+        self.swap_interval = swap_interval
+        self.processes = processes
+        self.positive_only = positive_only
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.rng = random.Random('%r/swap' % (seed,))
+        complexity = f_complexity(self.factors)
+        self.chains = []
+        for i, bias in enumerate(sorted(biases)):
+            self.chains.append({
+                'bias': bias,
+                'factors': list(self.factors),
+                'complexity': complexity,
+                'moves_to_get_here': [],
+                'best': {
+                    'complexity': complexity,
+                    'factors': list(self.factors),
+                    'moves_to_get_here': [],
+                },
+                'rng_state': random.Random('%r/%r' % (seed, i)).getstate(),
+            })
+        self.steps = 0
+        self.swaps = 0
+        self.rounds = 0
+
+    @property
+    def best(self):
+        """The best factorization any chain has seen."""
+        return min((c['best'] for c in self.chains),
+                   key=lambda x: x['complexity'])
+
+    def _exchange(self):
+        # Alternate between the even and the odd adjacent pairs
+        chains = self.chains
+        for i in range(self.rounds % 2, len(chains) - 1, 2):
+            one, two = chains[i], chains[i + 1]
+            exponent = one['complexity'] - two['complexity']
+            if exponent <= 0 or self.rng.random() < (one['bias'] / two['bias']) ** exponent:
+                for name in ('factors', 'complexity', 'moves_to_get_here'):
+                    one[name], two[name] = two[name], one[name]
+                self.swaps += 1
+        self.rounds += 1
+
+    def run(self, steps=None, seconds=None, stop_at=None):
+        """
+        Run every chain for steps steps, or until seconds have passed or
+        the best complexity is at most stop_at, and return the best
+        factorization with the moves to reach it.
+        """
+        if steps is None and seconds is None and stop_at is None:
+            raise ValueError('TemperedSearch.run needs steps, seconds or stop_at')
+        deadline = None if seconds is None else time.time() + seconds
+        pool = None
+        if self.processes != 1:
+            pool = multiprocessing.Pool(self.processes)
+        try:
+            done = 0
+            while steps is None or done < steps:
+                if deadline is not None and time.time() >= deadline:
+                    break
+                if stop_at is not None and self.best['complexity'] <= stop_at:
+                    break
+                chunk = self.swap_interval
+                if steps is not None:
+                    chunk = min(chunk, steps - done)
+                tasks = [(c, self.f_complexity, self.positive_only, chunk)
+                         for c in self.chains]
+                if pool is None:
+                    self.chains = list(map(_advance_chain, tasks))
+                else:
+                    self.chains = pool.map(_advance_chain, tasks)
+                done += chunk
+                self.steps += chunk
+                self._exchange()
+        except KeyboardInterrupt:
+            lineout('Interrupted.\n')
+        finally:
+            if pool is not None:
+                pool.terminate()
+        return self.best
+
+
+def _neighbours(factors, f_key):
+    """(key, factorization) for each Hurwitz move from factors."""
+    n = len(factors)
+    for i in list(range(1 - n, 0)) + list(range(1, n)):
+        newfactors = list(factors)
+        factorization_twist(newfactors, i)
+        yield f_key(newfactors), newfactors
+
+
+def _shard(key, shards):
+    return int.from_bytes(key[:8], 'little') % shards
+
+
+def _orbit_worker(index, shards, inboxes, control, results, root, f_key, batch_size):
+    """
+    One shard of hurwitz_orbit: owns the factorizations whose keys hash to
+    index, expands its part of each layer and sends every new
+    factorization to the shard that owns it, in batches, each key at most
+    once per layer.  Factorizations stay lists of PackedBraid throughout,
+    twisted with PackedBraid arithmetic.  Before each layer, control
+    says whether to expand it; the layer ends with a None from every
+    shard, and the count of new factorizations then goes to results.
+    """
+    inbox = inboxes[index]
+    visited = set()
+    frontier = []
+    key = f_key(root)
+    if _shard(key, shards) == index:
+        visited.add(key)
+        frontier.append([PackedBraid(x) for x in root])
+    while control.get():
+        layer = []
+        outgoing = [[] for _ in range(0, shards)]
+        sent = set()
+        for packed in frontier:
+            for key, newfactors in _neighbours(packed, f_key):
+                j = _shard(key, shards)
+                if j == index:
+                    if key not in visited:
+                        visited.add(key)
+                        layer.append(newfactors)
+                    continue
+                if key in sent:
+                    continue
+                sent.add(key)
+                outgoing[j].append((key, newfactors))
+                if len(outgoing[j]) >= batch_size:
+                    inboxes[j].put(outgoing[j])
+                    outgoing[j] = []
+        for j in range(0, shards):
+            if j != index:
+                if outgoing[j]:
+                    inboxes[j].put(outgoing[j])
+                inboxes[j].put(None)
+        done = 1
+        while done < shards:
+            batch = inbox.get()
+            if batch is None:
+                done += 1
+                continue
+            for key, packed in batch:
+                if key not in visited:
+                    visited.add(key)
+                    layer.append(packed)
+        frontier = layer
+        results.put(len(layer))
+
+
+def hurwitz_orbit(factors, radius=None, processes=None, batch_size=1000,
+                  f_key=factorization_key):
+    """
+    Breadth-first enumeration of the Hurwitz orbit of a factorization of
+    braids, or of the ball of the given radius around it.
+
+    Returns a dict with the orbit 'size', the number of factorizations
+    at each distance ('layers') and whether the whole orbit was found
+    ('complete').  Factorizations with the same f_key count as one, so
+    f_key=conjugation_key enumerates the orbit up to conjugation by
+    powers of D.
+
+    With processes other than 1, the orbit is split into one shard per
+    process by the hash of f_key.  Each shard keeps only the
+    keys it owns, and new factorizations stream between shards, packed as
+    PackedBraid, in batches of batch_size, one layer at a time.
+
+    >>> factors = [Braid([1], 3), Braid([2], 3), Braid([1, 2, -1], 3)]
+    >>> orbit = hurwitz_orbit(factors, processes=1)
+    >>> orbit['size'], orbit['layers'], orbit['complete']
+    (8, [1, 4, 3], True)
+    >>> hurwitz_orbit(factors, processes=2) == orbit
+    True
+    >>> hurwitz_orbit(factors, radius=1, processes=1)['layers'] == orbit['layers'][:2]
+    True
+    >>> ball = hurwitz_orbit(factors, radius=0, processes=1)
+    >>> ball['size'], ball['layers'], ball['complete']
+    (1, [1], False)
+    >>> hurwitz_orbit(factors, radius=0, processes=2) == ball
+    True
+
+    The three factorizations in the orbit of (a_32, a_21) in B_3 are
+    conjugates of each other by powers of D
+    >>> factors = [Braid([2], 3), Braid([1], 3)]
+    >>> hurwitz_orbit(factors, processes=1)['size']
+    3
+    >>> hurwitz_orbit(factors, processes=1, f_key=conjugation_key)['size']
+    1
+
+    """
+    factors = list(factors)
+    layers = [1]
+    if processes == 1:
+        visited = set([f_key(factors)])
+        frontier = [factors]
+        while frontier and (radius is None or len(layers) <= radius):
+            layer = []
+            for f in frontier:
+                for key, newfactors in _neighbours(f, f_key):
+                    if key not in visited:
+                        visited.add(key)
+                        layer.append(newfactors)
+            if layer:
+                layers.append(len(layer))
+            frontier = layer
+        return {'size': sum(layers), 'layers': layers, 'complete': not frontier}
+
+    shards = processes or multiprocessing.cpu_count()
+    inboxes = [multiprocessing.Queue() for _ in range(0, shards)]
+    controls = [multiprocessing.Queue() for _ in range(0, shards)]
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(
+        target=_orbit_worker,
+        args=(i, shards, inboxes, controls[i], results, factors, f_key, batch_size))
+        for i in range(0, shards)]
+    for w in workers:
+        w.daemon = True
+        w.start()
+    try:
+        complete = False
+        more = radius is None or len(layers) <= radius
+        while True:
+            for c in controls:
+                c.put(more)
+            if not more:
+                break
+            count = sum(results.get() for _ in range(0, shards))
+            if count:
+                layers.append(count)
+            else:
+                complete = True
+            more = bool(count) and (radius is None or len(layers) <= radius)
+        for w in workers:
+            w.join()
+    finally:
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+    return {'size': sum(layers), 'layers': layers, 'complete': complete}
+
+
 def Bridge(search_type, one, two, f_complexity=complexity_mixed, **kwargs):
     if f_complexity(one) < f_complexity(two):
         smaller = one
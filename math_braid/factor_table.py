@@ -0,0 +1,262 @@
+#!/usr/bin/python
+
+"""
+Complete lookup tables of canonical factors for small braid widths.
+
+The canonical factors of B_n are the non-crossing partitions of n points,
+so there are Catalan(n) of them: 429 for n = 7, 1430 for n = 8.  At that
+size every factor can be ranked to an integer and the products, meets,
+tau, left complements and left quotients (~m * x, the only use of an
+inverse in left-weighting) tabulated once.  CanonicalFactor.meet and
+Braid.cleanUpFactors then work on integer ranks by table lookups.
+
+Tables are opt-in, built lazily per n and optionally kept on disk:
+
+    FactorTable.enable(max_n=7, directory='~/.cache/math_braid')
+
+"""
+
+import itertools
+import os
+import pickle
+from array import array
+
+from .canonical_factor import CanonicalFactor, _dCycles, _fromDcycles, _meetDcycles
+
+
+def _noncrossing(elements):
+    """Yield the non-crossing partitions of a sorted list, as lists of blocks."""
+    if not elements:
+        yield []
+        return
+    first, rest = elements[0], elements[1:]
+    # Choose the rest of the first element's block; the gaps between its
+    # members are then partitioned independently.
+    for size in range(0, len(rest) + 1):
+        for chosen in itertools.combinations(range(0, len(rest)), size):
+            block = [first] + [rest[i] for i in chosen]
+            bounds = [-1] + list(chosen) + [len(rest)]
+            gaps = [rest[bounds[i] + 1:bounds[i + 1]] for i in range(0, len(bounds) - 1)]
+            for parts in itertools.product(*[list(_noncrossing(g)) for g in gaps]):
+                yield [block] + [b for part in parts for b in part]
+
+
+def canonicalFactors(n):
+    """
+    All canonical factors of width n, sorted by array form.
+
+    >>> [len(canonicalFactors(n)) for n in range(1, 8)]
+    [1, 2, 5, 14, 42, 132, 429]
+
+    """
+    ans = []
+    for blocks in _noncrossing(list(range(0, n))):
+        d_cycles = [0] * n
+        for block in blocks:
+            for x in block:
+                d_cycles[x] = block[-1]
+        ans.append(tuple(_fromDcycles(d_cycles)))
+    ans.sort()
+    return ans
+
+
+class FactorTable:
+    """
+    Rank, product, meet, tau, complement and quotient tables for width n.
+
+    Ranks index self.factors.  Binary tables are flat arrays indexed by
+    x * size + y; entries of -1 in the product table mark products that
+    are not canonical factors.
+
+    >>> table = FactorTable(5)
+    >>> table.size
+    42
+    >>> x = CanonicalFactor([0, 4, 2, 3, 1])
+    >>> y = CanonicalFactor([0, 4, 3, 2, 1])
+    >>> table.factors[table.meet[table.rankOf(x) * table.size + table.rankOf(y)]]
+    CanonicalFactor([0, 4, 2, 3, 1])
+    >>> table.factors[table.tau[2][table.rankOf(x)]] == x.tau(2)
+    True
+    >>> table.product[table.delta * table.size + table.rankOf(x)]
+    -1
+
+    """
+
+    # Bump when the layout below changes, so stale files on disk are rebuilt
+    version = 1
+
+    # The binary tables have Catalan(n) ** 2 entries, built in pure Python:
+    # about two million for n = 8 and 280 million for n = 10
+    maxWidth = 8
+
+    def __init__(self, n):
+        if n > self.maxWidth:
+            raise ValueError('Factor tables are only supported for n <= %d' % self.maxWidth)
+        self.n = n
+        forms = canonicalFactors(n)
+        self.size = size = len(forms)
+        # Ranks must fit the array type
+        typecode = 'h' if size <= 32767 else 'i'
+        self.rank = dict((x, i) for i, x in enumerate(forms))
+        self.factors = [CanonicalFactor(list(x)) for x in forms]
+        self.identity = self.rank[tuple(range(0, n))]
+        self.delta = self.rank[tuple([n - 1] + list(range(0, n - 1)))]
+        rank = self.rank
+
+        self.complement = array(typecode, [
+            rank[tuple(x.complement().array_form)] for x in self.factors])
+        self.tau = [
+            array(typecode, [rank[tuple(x.tau(k).array_form)] for x in self.factors])
+            for k in range(0, n)]
+
+        d_cycles = [_dCycles(x) for x in forms]
+        self.meet = array(typecode, [0] * (size * size))
+        for i in range(0, size):
+            for j in range(i, size):
+                m = rank[tuple(_fromDcycles(_meetDcycles(d_cycles[i], d_cycles[j])))]
+                self.meet[i * size + j] = self.meet[j * size + i] = m
+
+        # x * y is a canonical factor exactly when y <= ~x * D
+        self.product = array(typecode, [-1] * (size * size))
+        self.quotient = array(typecode, [-1] * (size * size))
+        for i, x in enumerate(forms):
+            c = self.complement[i] * size
+            for j, y in enumerate(forms):
+                if self.meet[c + j] == j:
+                    z = rank[tuple(x[v] for v in y)]
+                    self.product[i * size + j] = z
+                    # x * y == z, so ~x * z == y
+                    self.quotient[i * size + z] = j
+
+    def rankOf(self, factor):
+        return self.rank[tuple(factor.array_form)]
+
+    def leftWeight(self, ranks):
+        """
+        Left-weight a list of factor ranks in place, as cleanUpFactors does.
+
+        Returns the number of copies of D cut from the left;
+        identity factors are cut from the right.
+
+        """
+        size = self.size
+        meet, product, quotient = self.meet, self.product, self.quotient
+        complement, identity = self.complement, self.identity
+        changed = True
+        while changed:
+            changed = False
+            for j in range(len(ranks) - 2, -1, -1):
+                m = meet[complement[ranks[j]] * size + ranks[j + 1]]
+                if m != identity:
+                    ranks[j + 1] = quotient[m * size + ranks[j + 1]]
+                    ranks[j] = product[ranks[j] * size + m]
+                    changed = True
+        while ranks and ranks[-1] == identity:
+            ranks.pop()
+        lead = 0
+        while lead < len(ranks) and ranks[lead] == self.delta:
+            lead += 1
+        del ranks[:lead]
+        return lead
+
+    ###########
+    # Storage #
+    ###########
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump((self.version, self), f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            version, table = pickle.load(f)
+        if version != cls.version:
+            raise ValueError('Stale factor table: %s' % path)
+        return table
+
+    ##############
+    # Activation #
+    ##############
+
+    @classmethod
+    def get(cls, n, directory=None):
+        """Load the table for width n from directory, or build (and save) it."""
+        if directory is None:
+            return cls(n)
+        directory = os.path.expanduser(directory)
+        path = os.path.join(directory, 'factor_table_%s.pickle' % n)
+        try:
+            return cls.load(path)
+        except (IOError, EOFError, ValueError, pickle.UnpicklingError):
+            table = cls(n)
+            os.makedirs(directory, exist_ok=True)
+            table.save(path)
+            return table
+
+    @classmethod
+    def enable(cls, max_n=7, directory=None):
+        """
+        Use lookup tables for every width up to max_n, which can be at most
+        maxWidth.
+
+        Each table is built (or loaded from directory) the first time a
+        factor of that width needs it.
+
+        >>> from .braid import Braid
+        >>> word = [1, -2, 3, 3, -4, 1, 2, -1, -1]
+        >>> FactorTable.enable(5)
+        >>> withTables = str(Braid(word, 5))
+        >>> withTables[:40]
+        '[5] D^(-3) * [3, 0, 1, 2, 4] * [3, 1, 0,'
+
+        Braids built from plain permutation lists still normalize, and
+        their factors are copies of the table's
+        >>> b = Braid([[0, 1, 3, 2, 4], [0, 3, 2, 4, 1]], 5)
+        >>> str(b)
+        '[5] D^(0) * [0, 4, 3, 2, 1] * [0, 3, 2, 1, 4]'
+        >>> table = CanonicalFactor._tables.get(5)
+        >>> r = table.rankOf(b.a[0])
+        >>> b.a[0].array_form[1:3] = [3, 4]
+        >>> table.factors[r]
+        CanonicalFactor([0, 4, 3, 2, 1])
+        >>> FactorTable.disable()
+        >>> str(Braid(word, 5)) == withTables
+        True
+        >>> FactorTable.enable(10)
+        Traceback (most recent call last):
+            ...
+        ValueError: Factor tables are only supported for n <= 8
+
+        """
+        if max_n > cls.maxWidth:
+            raise ValueError('Factor tables are only supported for n <= %d' % cls.maxWidth)
+        CanonicalFactor._tables = _TableRegistry(max_n, directory)
+
+    @classmethod
+    def disable(cls):
+        """Go back to computing factors without tables."""
+        CanonicalFactor._tables = {}
+
+
+class _TableRegistry(dict):
+    """Maps n to its FactorTable, building tables for n <= max_n on demand."""
+
+    def __init__(self, max_n, directory=None):
+        super().__init__()
+        self.max_n = min(max_n, FactorTable.maxWidth)
+        self.directory = directory
+
+    def get(self, n, default=None):
+        try:
+            return self[n]
+        except KeyError:
+            if not 0 < n <= self.max_n:
+                return default
+            table = self[n] = FactorTable.get(n, self.directory)
+            return table
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
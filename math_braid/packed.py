@@ -0,0 +1,286 @@
+#!/usr/bin/python
+
+"""
+Braids stored as one flat factor table.
+
+A PackedBraid keeps its k canonical factors back to back in a single
+array('H') of length k * n, instead of a list of CanonicalFactor objects
+that each wrap their own list.  Factors are read as zero-copy memoryview
+slices, and multiplication, inversion and normalization work on the
+buffer directly.
+
+"""
+
+from array import array
+
+from .braid import Braid
+from .canonical_factor import (
+    CanonicalFactor, _complement, _dCycles, _fromDcycles, _meetDcycles, _tau)
+
+
+class PackedBraid:
+    """
+    A braid in left-greedy normal form, D^p A_1 A_2 ... A_k,
+    with A_1 ... A_k kept in one flat buffer.
+
+    Properties:
+        n: braid width (number of strands)
+        p: power of fundamental element D in left canonical form
+        k: number of canonical factors (implemented via a getter)
+        buf: array('H') holding the k factors, n entries each
+
+    Input is another PackedBraid, a Braid, or anything Braid accepts.
+
+    >>> b = PackedBraid([-3, 1], 5)
+    >>> b
+    PackedBraid(B[5]([[4, 0, 2, 1, 3], [1, 0, 2, 3, 4]], -1))
+    >>> b.factor(0).tolist()
+    [4, 0, 2, 1, 3]
+    >>> b.toBraid() == Braid([-3, 1], 5)
+    True
+
+    Arithmetic agrees with Braid
+    >>> x = PackedBraid([5, 1, -2, 4, 3, -1, -2], 6)
+    >>> not x * ~x
+    True
+    >>> (x * x).toBraid() == Braid([5, 1, -2, 4, 3, -1, -2] * 2, 6)
+    True
+    >>> ~x == PackedBraid(~Braid([5, 1, -2, 4, 3, -1, -2], 6))
+    True
+
+    """
+
+    typecode = 'H'
+
+    def __init__(self, obj=None, n=None, p=None):
+        if isinstance(obj, PackedBraid):
+            self.n = obj.n
+            self.p = obj.p
+            self.buf = array(self.typecode, obj.buf)
+            self.clean = obj.clean
+            return
+        if not isinstance(obj, Braid):
+            obj = Braid(obj, n, p)
+        self.n = obj.n
+        self.p = obj.p
+        self.buf = array(self.typecode)
+        for x in obj.a:
+            self.buf.extend(x.array_form)
+        self.clean = obj.clean
+
+    @classmethod
+    def _fromBuffer(cls, n, p, buf, clean=False):
+        ans = cls.__new__(cls)
+        ans.n = n
+        ans.p = p
+        ans.buf = buf
+        ans.clean = clean
+        return ans
+
+    ##########
+    # Access #
+    ##########
+
+    def __len__(self):
+        """Return the number of canonical factors."""
+        return len(self.buf) // self.n if self.n else 0
+
+    @property
+    def k(self):
+        return len(self)
+
+    def factor(self, i):
+        """Canonical factor i as a zero-copy view into the buffer."""
+        return memoryview(self.buf)[i * self.n:(i + 1) * self.n]
+
+    def factors(self):
+        """Iterate over zero-copy views of all canonical factors."""
+        view = memoryview(self.buf)
+        return (view[i:i + self.n] for i in range(0, len(self.buf), self.n or 1))
+
+    @property
+    def a(self):
+        """The canonical factors as a list of CanonicalFactor objects."""
+        return [CanonicalFactor(x.tolist()) for x in self.factors()]
+
+    def toBraid(self):
+        """Convert to a Braid with one CanonicalFactor per factor."""
+        ans = Braid(self.a, self.n, self.p)
+        ans.clean = self.clean
+        return ans
+
+    ##############
+    # Normalizer #
+    ##############
+
+    def cleanUpFactors(self):
+        """Left-weight the factors in place, as Braid.cleanUpFactors does."""
+        if self.clean:
+            return
+        self.clean = True
+        n = self.n
+        k = len(self)
+        ident = array(self.typecode, range(0, n))
+        d = array(self.typecode, [n - 1] + list(range(0, n - 1)))
+        trivial = ident.tolist()
+        view = memoryview(self.buf)
+
+        def _meet(j):
+            # Returns the meet (~A_j * D) /\ A_{j+1}, or False if trivial
+            d_cycles = _meetDcycles(
+                _dCycles(_complement(view[j * n:(j + 1) * n])),
+                _dCycles(view[(j + 1) * n:(j + 2) * n]))
+            return d_cycles != trivial and _fromDcycles(d_cycles)
+
+        leftmost = -1
+        rightmost = k - 2
+        meets = [None] * k
+        while leftmost < rightmost:
+            newleft = rightmost
+            for j in range(rightmost, leftmost, -1):
+                if meets[j] is None:
+                    meets[j] = _meet(j)
+                if meets[j]:
+                    # Shift b one factor to the left
+                    newleft = j
+                    m = meets[j]
+                    m_inv = [0] * n
+                    for i, v in enumerate(m):
+                        m_inv[v] = i
+                    left = view[j * n:(j + 1) * n]
+                    right = view[(j + 1) * n:(j + 2) * n]
+                    right[:] = array(self.typecode, [m_inv[v] for v in right])
+                    left[:] = array(self.typecode, [left[v] for v in m])
+
+                    if right == ident and rightmost == j:
+                        rightmost -= 1
+                    meets[j + 1] = None
+                    meets[j] = None
+                    meets[j - 1] = None
+            leftmost = newleft
+
+        # Cut out the identity elements from the right
+        # and copies of D from the left
+        end = rightmost + 2
+        while end > 0 and view[(end - 1) * n:end * n] == ident:
+            end -= 1
+        start = 0
+        while start < end and view[start * n:(start + 1) * n] == d:
+            start += 1
+        view.release()
+        self.p += start
+        if start or end < k:
+            self.buf = self.buf[start * n:end * n]
+
+    ####################
+    # Group Arithmetic #
+    ####################
+
+    def __mul__(self, other):
+        """
+        Multiplication of braids.
+
+        >>> PackedBraid([1], 5) * PackedBraid([2], 5) == PackedBraid([1, 2], 5)
+        True
+
+        """
+        if isinstance(other, Braid):
+            other = PackedBraid(other)
+        # Shortcut for identity elements
+        if not self:
+            try:
+                return PackedBraid(other)
+            except NotImplementedError:
+                return NotImplemented
+        if isinstance(other, int) or not other:
+            return PackedBraid(self)
+        # Ensure compatible braids
+        if not isinstance(other, PackedBraid) or self.n != other.n:
+            return NotImplemented
+        # Combine information and construct the product
+        n = self.n
+        if other.p % n:
+            buf = array(self.typecode)
+            for x in self.factors():
+                buf.extend(_tau(x, other.p))
+        else:
+            buf = array(self.typecode, self.buf)
+        buf.extend(other.buf)
+        return self._fromBuffer(n, self.p + other.p, buf)
+
+    def __invert__(self):
+        """Inverse of a braid."""
+        # Shortcut for identity elements
+        if not self:
+            return PackedBraid(self)
+        # Transform and reverse the list of canonical factors
+        n = self.n
+        k = self.k
+        view = memoryview(self.buf)
+        buf = array(self.typecode)
+        for i in range(k - 1, -1, -1):
+            buf.extend(_tau(_complement(view[i * n:(i + 1) * n]), -self.p - i - 1))
+        return self._fromBuffer(n, -self.p - k, buf)
+
+    def tau(self, power=1):
+        """
+        Conjugate by a power of D, as Braid.tau does, factor by factor.
+
+        >>> x = PackedBraid([5, 1, -2, 4, 3, -1, -2], 6)
+        >>> x.tau(2).toBraid() == x.toBraid().tau(2)
+        True
+
+        """
+        if not (power % (self.n or 1)):
+            return PackedBraid(self)
+        buf = array(self.typecode)
+        for x in self.factors():
+            buf.extend(_tau(x, power))
+        return self._fromBuffer(self.n, self.p, buf, self.clean)
+
+    def __eq__(self, other):
+        """Equality test, with the same identity quirk as Braid."""
+        if isinstance(other, Braid):
+            other = PackedBraid(other)
+        if isinstance(other, int) or not other:
+            return not self
+        if not isinstance(other, PackedBraid) or self.n != other.n:
+            return NotImplemented
+        self.cleanUpFactors()
+        other.cleanUpFactors()
+        return self.p == other.p and self.buf == other.buf
+
+    def key(self):
+        """
+        The same canonical byte string as Braid.key.
+
+        >>> PackedBraid([1, 2, 1], 3).key() == Braid([2, 1, 2], 3).key()
+        True
+
+        """
+        if not self:
+            return b''
+        return b'%d:%d:' % (self.n, self.p) + self.buf.tobytes()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __bool__(self):
+        self.cleanUpFactors()
+        return self.p != 0 or len(self.buf) != 0
+    __nonzero__ = __bool__
+
+    ###########
+    # Display #
+    ###########
+
+    def __str__(self):
+        return str(self.toBraid())
+
+    def __repr__(self):
+        return 'PackedBraid(%r)' % self.toBraid()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -44,6 +44,10 @@ class Permutation:
             # Copy another permutation
             self.size = obj.size
             self.array_form = list(obj.array_form)
+        elif isinstance(getattr(obj, 'array_form', None), tuple):
+            # Copy an immutable factor, e.g. a FrozenFactor
+            self.size = len(obj.array_form)
+            self.array_form = list(obj.array_form)
         elif obj is 1 or not obj:
             # Identity element
             self.size = 0
@@ -15,6 +15,7 @@ setup(
     keywords="Math Braid Permutation",
     python_requires='>=3',
     install_requires=["sympy>=1.0"],
+    extras_require={"numpy": ["numpy"]},
     classifiers=[
         'License :: OSI Approved :: BSD License',
         'Operating System :: OS Independent',